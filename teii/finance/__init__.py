@@ -4,13 +4,41 @@ from .exception import FinanceClientInvalidData
 from .exception import FinanceClientIOError
 from .exception import FinanceClientParamError
 
+from .archive import PayloadArchive
 from .finance import FinanceClient
 from .timeseries import TimeSeriesFinanceClient
+from .search import SymbolSearchFinanceClient
+from .search import SymbolIndex
+from .shared import SharedTimeSeries
+from .shared import SharedTimeSeriesStore
+from .refresher import WatchlistRefresher
+from .interchange import FinanceClientCollection
+from .interchange import read_arrow_stream
+from .analytics import align_prices
+from .analytics import correlation_matrix
+from .analytics import covariance_matrix
+from .backtest import backtest_crossover
+from .emulator import AlphaVantageEmulator
+from .emulator import synthetic_weekly_adjusted
 
 __all__ = ('FinanceClientInvalidAPIKey',
            'FinanceClientAPIError',
            'FinanceClientInvalidData',
            'FinanceClientIOError',
            'FinanceClientParamError',
+           'PayloadArchive',
            'FinanceClient',
-           'TimeSeriesFinanceClient')
+           'TimeSeriesFinanceClient',
+           'SymbolSearchFinanceClient',
+           'SymbolIndex',
+           'SharedTimeSeries',
+           'SharedTimeSeriesStore',
+           'WatchlistRefresher',
+           'FinanceClientCollection',
+           'read_arrow_stream',
+           'align_prices',
+           'correlation_matrix',
+           'covariance_matrix',
+           'backtest_crossover',
+           'AlphaVantageEmulator',
+           'synthetic_weekly_adjusted')
@@ -0,0 +1,227 @@
+""" Multi-ticker analytics """
+
+
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Mapping, Optional, Tuple, Union
+
+from teii.finance import FinanceClientParamError
+from teii.finance import TimeSeriesFinanceClient
+
+
+SeriesSource = Mapping[str, Union[TimeSeriesFinanceClient, pd.Series]]
+
+
+def align_prices(sources: SeriesSource,
+                 from_date: Optional[dt.date] = None,
+                 to_date: Optional[dt.date] = None) -> pd.DataFrame:
+    """ Return weekly adjusted close prices of every ticker aligned on dates.
+
+    Parameters
+    ----------
+    sources : mapping
+        diccionario símbolo -> TimeSeriesFinanceClient (se usa su 'aclose') o pandas.Series
+    from_date : datetime.date
+        parámetro que indica desde qué fecha de inicio queremos buscar (opcional)
+    to_date : datetime.date
+        parámetro que indica hasta qué fecha final queremos buscar (opcional)
+
+    Returns
+    -------
+    data_frame : pandas.DataFrame
+        devuelve un data frame con una columna por símbolo y NaN en las semanas sin datos
+
+    Raises
+    ------
+    FinanceClientParamError
+        Si no hay series o la fecha from_date es posterior a to_date
+    """
+
+    if not sources:
+        raise FinanceClientParamError("No series to align")
+
+    series = {ticker: source.weekly_price() if isinstance(source, TimeSeriesFinanceClient) else source
+              for ticker, source in sources.items()}
+    data_frame = pd.concat(series, axis=1, join='outer', sort=True)
+
+    if from_date is not None and to_date is not None:
+        try:
+            assert from_date <= to_date
+        except Exception as e:
+            raise FinanceClientParamError("Error en los parámetros introducidos") from e
+        data_frame = data_frame.loc[pd.Timestamp(from_date):pd.Timestamp(to_date)]
+
+    return data_frame
+
+
+def _weekly_returns(prices: np.ndarray) -> np.ndarray:
+    """ Return simple returns, NaN where either price is missing. """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return prices[1:] / prices[:-1] - 1
+
+
+def _ew_weights(length: int, halflife: float) -> np.ndarray:
+    """ Return exponential weights (1 for the most recent row). """
+
+    if halflife <= 0:
+        raise FinanceClientParamError("Half-life must be positive")
+
+    return 0.5 ** (np.arange(length - 1, -1, -1) / halflife)
+
+
+def _block_moments(values: np.ndarray, mask: np.ndarray, weights: Optional[np.ndarray],
+                   rows: slice, cols: slice,
+                   min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """ Return pairwise-complete (covariance, correlation) of column blocks 'rows' x 'cols'.
+
+    With weights w, over the rows where both columns have data:
+        cov = (n·Σwxy - Σwx·Σwy) / (n² - Σw²),   n = Σw
+    which reduces to the sample covariance when all weights are 1.
+    """
+
+    xi, mi = values[:, rows], mask[:, rows]
+    xj, mj = values[:, cols], mask[:, cols]
+    wxi, wmi = (xi, mi) if weights is None else (xi * weights, mi * weights)
+
+    n = wmi.T @ mj
+    sx = wxi.T @ mj
+    sy = wmi.T @ xj
+    sxx = (wxi * xi).T @ mj
+    syy = wmi.T @ (xj * xj)
+    sxy = wxi.T @ xj
+    s2 = n if weights is None else (mi * weights * weights).T @ mj
+    count = n if weights is None else mi.T @ mj
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        numerator = n * sxy - sx * sy
+        cov = numerator / (n * n - s2)
+        corr = numerator / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+
+    invalid = count < max(min_periods, 2)
+    cov[invalid] = np.nan
+    corr[invalid] = np.nan
+
+    return cov, np.clip(corr, -1, 1)
+
+
+def _pairwise_moments(sources: SeriesSource,
+                      from_date: Optional[dt.date],
+                      to_date: Optional[dt.date],
+                      returns: bool,
+                      halflife: Optional[float],
+                      dtype: Union[str, np.dtype],
+                      block_size: int,
+                      n_jobs: int,
+                      min_periods: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """ Return (covariance, correlation) matrices computed block by block. """
+
+    if block_size < 1 or n_jobs < 1:
+        raise FinanceClientParamError("Block size and number of jobs must be positive")
+
+    prices = align_prices(sources, from_date, to_date)
+    values = prices.to_numpy(dtype='float64')
+    if returns:
+        values = _weekly_returns(values)
+
+    # Moments are shift invariant: centering every column (in float64) keeps
+    # the raw sums small, so they do not cancel out in lower precision
+    mask = ~np.isnan(values)
+    values = np.where(mask, values, 0)
+    values = np.where(mask, values - values.sum(axis=0) / np.maximum(mask.sum(axis=0), 1), 0).astype(dtype)
+    mask = mask.astype(dtype)
+    weights = None if halflife is None else _ew_weights(len(values), halflife).astype(dtype)[:, None]
+
+    columns = values.shape[1]
+    blocks = [slice(start, min(start + block_size, columns)) for start in range(0, columns, block_size)]
+    pairs: List[Tuple[slice, slice]] = [(rows, cols) for i, rows in enumerate(blocks) for cols in blocks[i:]]
+
+    cov = np.empty((columns, columns), dtype=dtype)
+    corr = np.empty((columns, columns), dtype=dtype)
+
+    def compute(pair: Tuple[slice, slice]) -> None:
+        rows, cols = pair
+        block_cov, block_corr = _block_moments(values, mask, weights, rows, cols, min_periods)
+        cov[rows, cols], corr[rows, cols] = block_cov, block_corr
+        cov[cols, rows], corr[cols, rows] = block_cov.T, block_corr.T
+
+    # NumPy releases the GIL in matrix products, so threads run blocks in parallel
+    if n_jobs == 1:
+        for pair in pairs:
+            compute(pair)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(compute, pairs))
+
+    return (pd.DataFrame(cov, index=prices.columns, columns=prices.columns),
+            pd.DataFrame(corr, index=prices.columns, columns=prices.columns))
+
+
+def correlation_matrix(sources: SeriesSource,
+                       from_date: Optional[dt.date] = None,
+                       to_date: Optional[dt.date] = None,
+                       returns: bool = True,
+                       halflife: Optional[float] = None,
+                       dtype: Union[str, np.dtype] = 'float64',
+                       block_size: int = 256,
+                       n_jobs: int = 1,
+                       min_periods: int = 2) -> pd.DataFrame:
+    """ Return pairwise-complete correlation matrix of many tickers.
+
+    Parameters
+    ----------
+    sources : mapping
+        diccionario símbolo -> TimeSeriesFinanceClient (se usa su 'aclose') o pandas.Series
+    from_date : datetime.date
+        parámetro que indica desde qué fecha de inicio queremos buscar (opcional)
+    to_date : datetime.date
+        parámetro que indica hasta qué fecha final queremos buscar (opcional)
+    returns : bool
+        si es True se correlan las rentabilidades semanales en lugar de los precios
+    halflife : float
+        vida media en semanas de los pesos exponenciales (opcional, sin pesos por defecto)
+    dtype : str
+        precisión del cálculo ('float64' o 'float32')
+    block_size : int
+        número de símbolos por bloque
+    n_jobs : int
+        número de hilos que calculan bloques en paralelo
+    min_periods : int
+        número mínimo de semanas comunes para cada par de símbolos
+
+    Returns
+    -------
+    data_frame : pandas.DataFrame
+        devuelve una matriz símbolo x símbolo con NaN en los pares sin suficientes datos
+
+    Raises
+    ------
+    FinanceClientParamError
+        Si los parámetros no son válidos
+    """
+
+    return _pairwise_moments(sources, from_date, to_date, returns, halflife,
+                             dtype, block_size, n_jobs, min_periods)[1]
+
+
+def covariance_matrix(sources: SeriesSource,
+                      from_date: Optional[dt.date] = None,
+                      to_date: Optional[dt.date] = None,
+                      returns: bool = True,
+                      halflife: Optional[float] = None,
+                      dtype: Union[str, np.dtype] = 'float64',
+                      block_size: int = 256,
+                      n_jobs: int = 1,
+                      min_periods: int = 2) -> pd.DataFrame:
+    """ Return pairwise-complete covariance matrix of many tickers.
+
+    Parameters are those of correlation_matrix(). Without 'halflife' the
+    result is the sample covariance (as pandas.DataFrame.cov); with it,
+    the unbiased exponentially-weighted covariance.
+    """
+
+    return _pairwise_moments(sources, from_date, to_date, returns, halflife,
+                             dtype, block_size, n_jobs, min_periods)[0]
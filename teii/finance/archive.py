@@ -0,0 +1,155 @@
+""" Raw payload archive """
+
+
+import datetime as dt
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from teii.finance import FinanceClientIOError
+
+
+class PayloadArchive:
+    """ Content-addressed, compressed archive of raw API responses.
+
+        Layout:
+            ROOT/objects/AB/CDEF....json.gz     payload keyed by its SHA-256
+            ROOT/manifest.jsonl                 one line per fetch (ticker, query function, date, digest, valid)
+
+        Identical payloads (e.g. delisted tickers) are stored once; every
+        fetch is still recorded in the manifest for auditing. Responses that
+        failed validation (throttle notes, error messages) are archived too,
+        but marked as invalid so they are never loaded back.
+    """
+
+    _manifest_name = 'manifest.jsonl'
+
+    def __init__(self, root: Union[str, Path],
+                 compresslevel: int = 6,
+                 logging_level: Union[int, str] = logging.WARNING) -> None:
+        """ PayloadArchive constructor. """
+
+        self._root = Path(root)
+        self._compresslevel = compresslevel
+        self._logger = logging.getLogger(__name__)
+        self._logger.setLevel(logging_level)
+
+        try:
+            (self._root / 'objects').mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise FinanceClientIOError(f"Unable to create archive directory '{self._root}'") from e
+
+    def _object_path(self, digest: str) -> Path:
+        return self._root / 'objects' / digest[:2] / f"{digest[2:]}.json.gz"
+
+    def __contains__(self, digest: object) -> bool:
+        return isinstance(digest, str) and self._object_path(digest).is_file()
+
+    def put(self, ticker: str, payload: bytes,
+            fetched: Optional[dt.datetime] = None,
+            function: Optional[str] = None,
+            valid: bool = True) -> str:
+        """ Archive 'payload' fetched for 'ticker' and return its digest.
+
+        Parameters
+        ----------
+        ticker : str
+            símbolo al que corresponde la respuesta
+        payload : bytes
+            cuerpo de la respuesta tal cual se recibió
+        fetched : datetime.datetime
+            momento de la descarga (opcional, por defecto el actual)
+        function : str
+            función de la API consultada, p. ej. 'TIME_SERIES_WEEKLY_ADJUSTED' (opcional)
+        valid : bool
+            si es False la respuesta no superó la validación y latest() la ignora
+
+        Returns
+        -------
+        digest : str
+            hash SHA-256 del contenido, que lo identifica en el archivo
+
+        Raises
+        ------
+        FinanceClientIOError
+            Si no es posible escribir en el archivo
+        """
+
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._object_path(digest)
+        stored = not path.is_file()
+
+        try:
+            if stored:
+                path.parent.mkdir(exist_ok=True)
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                with gzip.open(tmp_path, 'wb', compresslevel=self._compresslevel) as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+
+            entry = {'ticker': ticker,
+                     'function': function,
+                     'fetched': (fetched or dt.datetime.now()).isoformat(),
+                     'digest': digest,
+                     'size': len(payload),
+                     'valid': valid}
+            with open(self._root / self._manifest_name, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            raise FinanceClientIOError(f"Unable to archive payload for '{ticker}'") from e
+
+        if stored:
+            self._logger.info(f"Payload for '{ticker}' archived as {digest}")
+        else:
+            self._logger.info(f"Payload for '{ticker}' already archived as {digest}")
+
+        return digest
+
+    def open(self, digest: str) -> gzip.GzipFile:
+        """ Return binary file object that decompresses payload 'digest' on read. """
+
+        try:
+            return gzip.open(self._object_path(digest), 'rb')
+        except OSError as e:
+            raise FinanceClientIOError(f"Payload {digest} not found in archive") from e
+
+    def get(self, digest: str) -> bytes:
+        """ Return payload 'digest'. """
+
+        with self.open(digest) as f:
+            return f.read()
+
+    def load_json(self, digest: str) -> Dict:
+        """ Return payload 'digest' parsed as JSON, decompressing while parsing. """
+
+        with self.open(digest) as f:
+            return json.load(f)
+
+    def entries(self, ticker: Optional[str] = None,
+                function: Optional[str] = None) -> List[Dict]:
+        """ Return manifest entries (only those of 'ticker' and 'function' if given), oldest first. """
+
+        try:
+            with open(self._root / self._manifest_name) as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            raise FinanceClientIOError("Unable to read archive manifest") from e
+
+        return [entry for entry in entries
+                if (ticker is None or entry['ticker'] == ticker)
+                and (function is None or entry.get('function') == function)]
+
+    def latest(self, ticker: str,
+               function: Optional[str] = None) -> Optional[str]:
+        """ Return digest of the last valid payload archived for 'ticker' and 'function' (None if none). """
+
+        entries = [entry for entry in self.entries(ticker, function) if entry.get('valid', True)]
+
+        return entries[-1]['digest'] if entries else None
@@ -0,0 +1,187 @@
+""" Vectorized strategy backtesting """
+
+
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from typing import Iterable, List, Mapping, Optional, Tuple, Union
+
+from teii.finance import FinanceClientParamError
+from teii.finance import TimeSeriesFinanceClient
+
+
+PriceSource = Mapping[str, Union[TimeSeriesFinanceClient, pd.DataFrame]]
+
+
+def _align_fields(sources: PriceSource,
+                  from_date: Optional[dt.date],
+                  to_date: Optional[dt.date]) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """ Return (aclose, close, dividend) data frames with one column per ticker. """
+
+    if not sources:
+        raise FinanceClientParamError("No tickers to backtest")
+
+    frames = {ticker: source.to_pandas() if isinstance(source, TimeSeriesFinanceClient) else source
+              for ticker, source in sources.items()}
+    try:
+        aclose = pd.concat({ticker: frame['aclose'] for ticker, frame in frames.items()}, axis=1, sort=True)
+        close = pd.concat({ticker: frame['close'] for ticker, frame in frames.items()}, axis=1, sort=True)
+        dividend = pd.concat({ticker: frame['dividend'] for ticker, frame in frames.items()}, axis=1, sort=True)
+    except KeyError as e:
+        raise FinanceClientParamError("Backtest data needs 'aclose', 'close' and 'dividend' columns") from e
+
+    if from_date is not None and to_date is not None:
+        try:
+            assert from_date <= to_date
+        except Exception as e:
+            raise FinanceClientParamError("Error en los parámetros introducidos") from e
+        aclose = aclose.loc[pd.Timestamp(from_date):pd.Timestamp(to_date)]
+        close = close.loc[pd.Timestamp(from_date):pd.Timestamp(to_date)]
+        dividend = dividend.loc[pd.Timestamp(from_date):pd.Timestamp(to_date)]
+
+    return aclose, close, dividend.fillna(0.0)
+
+
+def _moving_averages(close: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """ Return simple moving averages, shape (windows, weeks, tickers), NaN until each window fills.
+
+    Missing prices count as zero in the cumulative sums, so a ticker listed
+    later than the others only has NaN averages until its own windows fill.
+    """
+
+    valid = ~np.isnan(close)
+    zeros = np.zeros((1, close.shape[1]))
+    cumsum = np.vstack([zeros, np.cumsum(np.where(valid, close, 0.0), axis=0)])
+    count = np.vstack([zeros, np.cumsum(valid, axis=0)])
+    averages = np.full((len(windows),) + close.shape, np.nan)
+    for position, window in enumerate(windows):
+        if window <= close.shape[0]:
+            full = count[window:] - count[:-window] == window
+            averages[position, window - 1:] = np.where(full, (cumsum[window:] - cumsum[:-window]) / window, np.nan)
+
+    return averages
+
+
+def _check_windows(name: str, values: Iterable[int]) -> List[int]:
+    values = sorted(set(int(value) for value in values))
+    if not values or values[0] < 1:
+        raise FinanceClientParamError(f"'{name}' must contain positive integers")
+
+    return values
+
+
+def backtest_crossover(sources: PriceSource,
+                       fast_windows: Iterable[int],
+                       slow_windows: Iterable[int],
+                       rebalance_periods: Iterable[int] = (1,),
+                       from_date: Optional[dt.date] = None,
+                       to_date: Optional[dt.date] = None,
+                       reinvest_dividends: bool = True,
+                       periods_per_year: int = 52) -> pd.DataFrame:
+    """ Backtest a moving-average crossover strategy over a parameter grid.
+
+    Each week, every ticker is held (equally weighted, the rest in cash)
+    if its fast moving average of adjusted close prices was above the slow
+    one at the last rebalance, which happens every 'rebalance' weeks.
+    Signals use closes up to the previous week, so there is no look-ahead.
+    Adjusted closes keep stock splits out of both returns and signals.
+
+    The whole grid is evaluated at once on arrays of shape
+    (pairs of windows, rebalance periods, weeks, tickers).
+
+    Parameters
+    ----------
+    sources : mapping
+        diccionario símbolo -> TimeSeriesFinanceClient o data frame con columnas 'aclose', 'close' y 'dividend'
+    fast_windows : iterable
+        ventanas (en semanas) de la media móvil rápida
+    slow_windows : iterable
+        ventanas (en semanas) de la media móvil lenta; solo se evalúan los pares rápida < lenta
+    rebalance_periods : iterable
+        cada cuántas semanas se recalculan las posiciones
+    from_date : datetime.date
+        parámetro que indica desde qué fecha de inicio queremos buscar (opcional)
+    to_date : datetime.date
+        parámetro que indica hasta qué fecha final queremos buscar (opcional)
+    reinvest_dividends : bool
+        si es True los dividendos se reinvierten en la rentabilidad semanal
+    periods_per_year : int
+        número de periodos por año para anualizar
+
+    Returns
+    -------
+    data_frame : pandas.DataFrame
+        devuelve un data frame indexado por (fast, slow, rebalance) con la rentabilidad total y
+        anualizada, la volatilidad anualizada, el ratio de Sharpe, la máxima caída, la exposición
+        media y el número medio de operaciones por símbolo
+
+    Raises
+    ------
+    FinanceClientParamError
+        Si los parámetros no son válidos
+    """
+
+    fast = _check_windows('fast_windows', fast_windows)
+    slow = _check_windows('slow_windows', slow_windows)
+    rebalance = _check_windows('rebalance_periods', rebalance_periods)
+    pairs = [(f, s) for f in fast for s in slow if f < s]
+    if not pairs:
+        raise FinanceClientParamError("No fast window is shorter than a slow window")
+
+    aclose_frame, close_frame, dividend_frame = _align_fields(sources, from_date, to_date)
+    aclose = aclose_frame.to_numpy(dtype='float64')
+    close = close_frame.to_numpy(dtype='float64')
+    dividend = dividend_frame.to_numpy(dtype='float64')
+    weeks = aclose.shape[0]
+    if weeks < 2:
+        raise FinanceClientParamError("At least two weeks are needed to backtest")
+
+    # Weekly total returns (week t over week t-1) from adjusted closes; the
+    # price return removes the dividend yield, measured in week t units so
+    # that splits cancel out. NaN where the ticker has no data
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gross = aclose[1:] / aclose[:-1]
+        if not reinvest_dividends:
+            gross = gross * close[1:] / (close[1:] + dividend[1:])
+        returns = gross - 1
+    valid = ~np.isnan(returns)
+    returns = np.where(valid, returns, 0.0)
+    tickers = np.maximum(valid.sum(axis=1), 1)
+
+    # Signals at every week: (pairs, weeks, tickers)
+    windows = np.array(sorted(set(fast) | set(slow)))
+    averages = _moving_averages(aclose_frame.ffill().to_numpy(dtype='float64'), windows)
+    window_position = {window: position for position, window in enumerate(windows)}
+    fast_positions = [window_position[f] for f, _ in pairs]
+    slow_positions = [window_position[s] for _, s in pairs]
+    with np.errstate(invalid='ignore'):
+        signals = averages[fast_positions] > averages[slow_positions]
+
+    # Position held over week t decided at the last rebalance up to week t-1: (pairs, rebalances, weeks-1, tickers)
+    held = np.arange(weeks - 1)
+    decided = (held[None, :] // np.array(rebalance)[:, None]) * np.array(rebalance)[:, None]
+    positions = signals[:, decided].astype('float64')
+
+    portfolio = (positions * returns).sum(axis=-1) / tickers
+    equity = np.cumprod(1 + portfolio, axis=-1)
+    drawdown = 1 - equity / np.maximum.accumulate(equity, axis=-1)
+    mean = portfolio.mean(axis=-1)
+    std = portfolio.std(axis=-1, ddof=1) if weeks > 2 else np.full(mean.shape, np.nan)
+    total = equity[..., -1] - 1
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistics = {
+            'total_return':      total,
+            'annual_return':     (1 + total) ** (periods_per_year / (weeks - 1)) - 1,
+            'annual_volatility': std * np.sqrt(periods_per_year),
+            'sharpe':            mean / std * np.sqrt(periods_per_year),
+            'max_drawdown':      drawdown.max(axis=-1),
+            'exposure':          positions.mean(axis=(-2, -1)),
+            'trades':            np.abs(np.diff(positions, axis=-2)).sum(axis=-2).mean(axis=-1)
+        }
+
+    index = pd.MultiIndex.from_tuples([(f, s, r) for f, s in pairs for r in rebalance],
+                                      names=['fast', 'slow', 'rebalance'])
+
+    return pd.DataFrame({name: values.reshape(-1) for name, values in statistics.items()}, index=index)
@@ -0,0 +1,167 @@
+""" Query result cache """
+
+
+import collections
+import datetime as dt
+import functools
+import inspect
+import numpy as np
+import pandas as pd
+import threading
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar, cast
+
+from teii.finance import FinanceClientParamError
+
+
+class QueryCache:
+    """ Bounded LRU cache of query results with hit/miss statistics.
+
+        Safe to share between threads: every access holds an internal lock.
+        Each clear() starts a new generation; results computed during an
+        older generation are not stored (see put()).
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """ QueryCache constructor. """
+
+        if maxsize < 0:
+            raise FinanceClientParamError("Cache size must not be negative")
+
+        self._maxsize = maxsize
+        self._data: 'collections.OrderedDict[Hashable, Any]' = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """ Return (found, value) for 'key', marking it as most recently used. """
+
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return False, None
+
+            self._data.move_to_end(key)
+            self._hits += 1
+
+        return True, value
+
+    @property
+    def generation(self) -> int:
+        """ Return number of times the cache has been cleared. """
+
+        with self._lock:
+            return self._generation
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """ Store 'value' under 'key', evicting the least recently used entry if full.
+
+        If 'generation' (read before computing 'value') is given and the cache
+        has been cleared since, 'value' is stale and is not stored.
+        """
+
+        if self._maxsize == 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """ Drop all entries (statistics are kept). """
+
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def info(self) -> Dict[str, int]:
+        """ Return hit/miss statistics and occupancy. """
+
+        with self._lock:
+            return {'hits': self._hits,
+                    'misses': self._misses,
+                    'size': len(self._data),
+                    'maxsize': self._maxsize}
+
+
+def _normalize_arg(value: Any) -> Hashable:
+    """ Return hashable key for a query argument (dates of any type compare equal). """
+
+    if isinstance(value, (dt.date, np.datetime64)):
+        return pd.Timestamp(value)
+
+    return value
+
+
+def _read_only(value: Any) -> Any:
+    """ Return read-only copy of pandas results (other values are returned as is).
+
+    Every NumPy block is locked, since DataFrame.values is a copy when a
+    frame mixes dtypes. Columns backed by extension arrays stay writeable.
+    """
+
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        value = value.copy()
+        for values in value._mgr.arrays:
+            if isinstance(values, np.ndarray):
+                values.flags.writeable = False
+
+    return value
+
+
+def _new_wrapper(value: Any) -> Any:
+    """ Return new pandas object over the (read-only) buffers of 'value' (other values are returned as is).
+
+    Callers may then rename or reindex the result without altering the cached one.
+    """
+
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy(deep=False)
+
+    return value
+
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+def memoized_query(method: F) -> F:
+    """ Memoize query 'method' in the instance's '_query_cache'.
+
+    Arguments are bound to the method signature and normalized, so
+    positional and keyword calls with equivalent dates share an entry.
+    """
+
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, '_query_cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, tuple(_normalize_arg(value) for name, value in bound.arguments.items() if name != 'self'))
+
+        found, result = cache.get(key)
+        if not found:
+            # A refresh while computing clears the cache: the result is then not stored
+            generation = cache.generation
+            result = _read_only(method(self, *args, **kwargs))
+            cache.put(key, result, generation)
+
+        return _new_wrapper(result)
+
+    return cast(F, wrapper)
@@ -0,0 +1,265 @@
+""" Local Alpha Vantage emulator for load testing """
+
+
+import collections
+import datetime as dt
+import functools
+import json
+import logging
+import random
+import threading
+import time
+import zlib
+import numpy as np
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Collection, Deque, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+from teii.finance import FinanceClientParamError
+
+
+def synthetic_weekly_adjusted(ticker: str,
+                              weeks: int = 1000,
+                              end: dt.date = dt.date(2022, 2, 11),
+                              seed: int = 0) -> Dict:
+    """ Return deterministic synthetic TIME_SERIES_WEEKLY_ADJUSTED response for 'ticker'.
+
+    Parameters
+    ----------
+    ticker : str
+        símbolo; junto con 'seed' determina la serie generada
+    weeks : int
+        número de semanas de histórico
+    end : datetime.date
+        fecha de la última semana (se usa el viernes anterior o igual)
+    seed : int
+        semilla común a todos los símbolos
+
+    Returns
+    -------
+    json_data : dict
+        devuelve un diccionario con el mismo formato que la respuesta JSON de Alpha Vantage
+
+    Raises
+    ------
+    FinanceClientParamError
+        Si el número de semanas no es positivo
+    """
+
+    if weeks < 1:
+        raise FinanceClientParamError("Number of weeks must be positive")
+
+    rng = np.random.default_rng([seed, zlib.crc32(ticker.encode())])
+
+    # Weekly closes follow a geometric random walk
+    last_friday = end - dt.timedelta(days=(end.weekday() - 4) % 7)
+    close = rng.uniform(10, 300) * np.exp(np.cumsum(rng.normal(0.001, 0.04, weeks)))
+    previous = np.r_[close[0] * np.exp(rng.normal(0, 0.01)), close[:-1]]
+    open_ = previous * np.exp(rng.normal(0, 0.01, weeks))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.02, weeks)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.02, weeks)))
+    volume = rng.lognormal(np.log(rng.uniform(1e6, 5e7)), 0.3, weeks).astype(np.int64)
+
+    # Quarterly dividends (for about half of the tickers) adjust all previous closes
+    dividend = np.zeros(weeks)
+    if rng.random() < 0.5:
+        dividend[weeks - 1 - rng.integers(0, 13)::-13] = np.round(previous[0] * rng.uniform(0.002, 0.01), 2)
+    factor = np.r_[np.cumprod((1 - dividend / previous)[::-1])[::-1][1:], 1.0]
+    aclose = close * factor
+
+    series = {}
+    for week in range(weeks - 1, -1, -1):
+        date = last_friday - dt.timedelta(weeks=weeks - 1 - week)
+        series[date.isoformat()] = {
+            "1. open":              f"{open_[week]:.4f}",
+            "2. high":              f"{high[week]:.4f}",
+            "3. low":               f"{low[week]:.4f}",
+            "4. close":             f"{close[week]:.4f}",
+            "5. adjusted close":    f"{aclose[week]:.4f}",
+            "6. volume":            f"{volume[week]}",
+            "7. dividend amount":   f"{dividend[week]:.4f}"
+        }
+
+    return {
+        "Meta Data": {
+            "1. Information": "Weekly Adjusted Prices and Volumes",
+            "2. Symbol": ticker,
+            "3. Last Refreshed": last_friday.isoformat(),
+            "4. Time Zone": "US/Eastern"
+        },
+        "Weekly Adjusted Time Series": series
+    }
+
+
+class AlphaVantageEmulator:
+    """ Local HTTP stand-in for the Alpha Vantage TIME_SERIES_WEEKLY_ADJUSTED query.
+
+        Serves deterministic synthetic histories for any ticker, with
+        configurable latency, server errors (HTTP 503) and throttle
+        responses (HTTP 200 with a 'Note' field, as Alpha Vantage does).
+        Point the clients at it with the TEII_FINANCE_BASE_URL environment
+        variable set to 'base_url'.
+    """
+
+    _throttle_note = ("Thank you for using Alpha Vantage! Our standard API call frequency is "
+                      "5 calls per minute and 500 calls per day.")
+
+    _invalid_call_message = "Invalid API call. Please retry or visit the documentation for TIME_SERIES_WEEKLY_ADJUSTED."
+
+    def __init__(self, host: str = "127.0.0.1",
+                 port: int = 0,
+                 weeks: int = 1000,
+                 seed: int = 0,
+                 latency: float = 0.0,
+                 latency_jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 throttle_rate: float = 0.0,
+                 requests_per_minute: Optional[int] = None,
+                 invalid_tickers: Collection[str] = (),
+                 cache_size: int = 1024,
+                 logging_level: Union[int, str] = logging.WARNING) -> None:
+        """ AlphaVantageEmulator constructor.
+
+        'latency' and 'latency_jitter' are given in seconds; 'error_rate' and
+        'throttle_rate' are probabilities. If 'requests_per_minute' is set,
+        requests beyond it within a minute are throttled.
+        """
+
+        if not 0 <= error_rate <= 1 or not 0 <= throttle_rate <= 1:
+            raise FinanceClientParamError("Error and throttle rates must be between 0 and 1")
+        if latency < 0 or latency_jitter < 0:
+            raise FinanceClientParamError("Latency must not be negative")
+
+        self._weeks = weeks
+        self._seed = seed
+        self._latency = latency
+        self._latency_jitter = latency_jitter
+        self._error_rate = error_rate
+        self._throttle_rate = throttle_rate
+        self._requests_per_minute = requests_per_minute
+        self._invalid_tickers = set(invalid_tickers)
+
+        self._logger = logging.getLogger(__name__)
+        self._logger.setLevel(logging_level)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests: Deque[float] = collections.deque()
+        self._stats = {'requests': 0, 'served': 0, 'errors': 0, 'throttled': 0, 'invalid': 0}
+        self._payload = functools.lru_cache(maxsize=cache_size)(self._build_payload)
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """ Return base query URL (value for TEII_FINANCE_BASE_URL). """
+
+        host, port = self._server.socket.getsockname()[:2]
+
+        return f"http://{host}:{port}/query?"
+
+    def stats(self) -> Dict[str, int]:
+        """ Return request counters. """
+
+        with self._lock:
+            return dict(self._stats)
+
+    def _build_payload(self, ticker: str) -> bytes:
+        return json.dumps(synthetic_weekly_adjusted(ticker, self._weeks, seed=self._seed)).encode()
+
+    def _outcome(self) -> str:
+        """ Return 'error', 'throttled' or 'ok' for a new request. """
+
+        with self._lock:
+            self._stats['requests'] += 1
+            now = time.monotonic()
+            if self._requests_per_minute is not None:
+                while self._requests and now - self._requests[0] >= 60:
+                    self._requests.popleft()
+                if len(self._requests) >= self._requests_per_minute:
+                    self._stats['throttled'] += 1
+                    return 'throttled'
+                self._requests.append(now)
+            draw = self._random.random()
+            if draw < self._error_rate:
+                self._stats['errors'] += 1
+                return 'error'
+            if draw < self._error_rate + self._throttle_rate:
+                self._stats['throttled'] += 1
+                return 'throttled'
+            delay = self._latency + self._random.uniform(0, self._latency_jitter)
+
+        time.sleep(delay)
+
+        return 'ok'
+
+    def respond(self, path: str) -> Tuple[int, bytes]:
+        """ Return (status, body) for request 'path' (used by the HTTP handler). """
+
+        url = urlparse(path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        outcome = self._outcome()
+        if outcome == 'error':
+            return 503, b"Service Unavailable"
+        if outcome == 'throttled':
+            return 200, json.dumps({"Note": self._throttle_note}).encode()
+
+        ticker = params.get("symbol", "")
+        if (url.path.rstrip("/") != "/query" or params.get("function") != "TIME_SERIES_WEEKLY_ADJUSTED"
+                or not params.get("apikey") or not ticker or ticker in self._invalid_tickers):
+            with self._lock:
+                self._stats['invalid'] += 1
+            return 200, json.dumps({"Error Message": self._invalid_call_message}).encode()
+
+        with self._lock:
+            self._stats['served'] += 1
+
+        return 200, self._payload(ticker)
+
+    def _handler_class(self) -> type:
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                status, body = emulator.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                emulator._logger.info(format % args)
+
+        return Handler
+
+    def start(self) -> None:
+        """ Serve requests in a background thread. """
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+        self._logger.info(f"Emulator listening on {self.base_url}")
+
+    def stop(self) -> None:
+        """ Stop serving and release the port. """
+
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> 'AlphaVantageEmulator':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
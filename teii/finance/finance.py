@@ -9,12 +9,18 @@ import requests
 
 from abc import ABC, abstractclassmethod, abstractmethod
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from teii.finance import FinanceClientInvalidAPIKey
 from teii.finance import FinanceClientAPIError
 from teii.finance import FinanceClientInvalidData
 from teii.finance import FinanceClientIOError
+from teii.finance import PayloadArchive
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 
 class FinanceClient(ABC):
@@ -25,36 +31,84 @@ class FinanceClient(ABC):
     def __init__(self, ticker: str,
                  api_key: Optional[str] = None,
                  logging_level: Union[int, str] = logging.WARNING,
-                 logging_file: Optional[str] = None) -> None:
-        """ FinanceClient constructor. """
+                 logging_file: Optional[str] = None,
+                 archive: Optional[PayloadArchive] = None,
+                 from_archive: bool = False) -> None:
+        """ FinanceClient constructor.
+
+        If 'archive' is given, every raw response is archived. If 'from_archive'
+        is also set, the last archived response is used instead of querying the API.
+        """
 
         self._ticker = ticker
         self._api_key = api_key
+        self._archive = archive
 
         # Logging configuration
         self._setup_logging(logging_level, logging_file)
 
-        # Finance API key configuration
-        self._logger.info("API key configuration")
-        if not self._api_key:
-            self._api_key = os.getenv("TEII_FINANCE_API_KEY")
-        if not self._api_key or not isinstance(self._api_key, str):
-            raise FinanceClientInvalidAPIKey(f"{self.__class__.__qualname__} operation failed")
+        # Finance API query
+        self._fetch_query_data(from_archive)
+
+        # Panda's Data Frame
+        self._data_frame = None
+
+    def _fetch_query_data(self, from_archive: bool = False) -> None:
+        """ Query Finance API (or load archived payload), process and validate data. """
 
-        # Query Finance API
-        self._logger.info("Finance API access...")
-        response = self._query_api()
+        payload = None
+        try:
+            if from_archive:
+                # Load archived payload
+                self._logger.info("Finance API archived payload access...")
+                json_data = self._load_archived_data()
+            else:
+                # Finance API key configuration
+                self._logger.info("API key configuration")
+                if not self._api_key:
+                    self._api_key = os.getenv("TEII_FINANCE_API_KEY")
+                if not self._api_key or not isinstance(self._api_key, str):
+                    raise FinanceClientInvalidAPIKey(f"{self.__class__.__qualname__} operation failed")
+
+                # Query Finance API
+                self._logger.info("Finance API access...")
+                response = self._query_api()
+                payload = response.content
+                json_data = self._decode_query_response(response)
+
+            # Process query response
+            self._logger.info("Finance API query response processing...")
+            self._process_query_response(json_data)
+
+            # Validate query data
+            self._logger.info("Finance API query data validation...")
+            self._validate_query_data()
+        except FinanceClientInvalidData:
+            # Invalid responses (e.g. throttle notes) are archived for auditing only
+            if payload is not None:
+                self._archive_payload(payload, valid=False)
+            raise
+
+        if payload is not None:
+            self._archive_payload(payload, valid=True)
+
+    def refresh(self) -> None:
+        """ Query Finance API again and rebuild data frame. """
+
+        self._fetch_query_data()
+        self._build_data_frame()
 
-        # Process query response
-        self._logger.info("Finance API query response processing...")
-        self._process_query_response(response)
+    @abstractmethod
+    def _build_data_frame(self) -> None:
+        """ Build Panda's DataFrame and format data. """
 
-        # Validate query data
-        self._logger.info("Finance API query data validation...")
-        self._validate_query_data()
+        pass
 
-        # Panda's Data Frame
-        self._data_frame = None
+    @property
+    def ticker(self) -> str:
+        """ Return ticker (or keywords) of the query. """
+
+        return self._ticker
 
     def _setup_logging(self,
                        logging_level: Union[int, str],
@@ -70,9 +124,18 @@ class FinanceClient(ABC):
             https://www.alphavantage.co/documentation/
         URL format:
             https://www.alphavantage.co/query?PARAMS
+        It can be overridden with the TEII_FINANCE_BASE_URL environment
+        variable (e.g. to use a local emulator).
         """
 
-        return cls._FinanceBaseQueryURL
+        return os.getenv("TEII_FINANCE_BASE_URL", cls._FinanceBaseQueryURL)
+
+    @classmethod
+    @abstractmethod
+    def _build_query_function(cls) -> str:
+        """ Return API query function (e.g. TIME_SERIES_WEEKLY_ADJUSTED). """
+
+        pass
 
     @abstractmethod
     def _build_base_query_url_params(self) -> str:
@@ -100,6 +163,41 @@ class FinanceClient(ABC):
                               f"[URL: {response.url}, status: {response.status_code}]")
         return response
 
+    def _decode_query_response(self, response: requests.Response) -> Dict:
+        """ Decode raw query response. """
+
+        try:
+            return json.loads(response.content)
+        except Exception as e:
+            raise FinanceClientInvalidData("Invalid data") from e
+
+    def _archive_payload(self, payload: bytes, valid: bool) -> None:
+        """ Archive raw query response (if archive is set). """
+
+        if self._archive is not None:
+            self._archive.put(self._ticker, payload, function=self._build_query_function(), valid=valid)
+
+    def _load_archived_data(self) -> Dict:
+        """ Return last archived query response. """
+
+        if self._archive is None:
+            raise FinanceClientIOError("No payload archive configured")
+
+        digest = self._archive.latest(self._ticker, self._build_query_function())
+        if digest is None:
+            raise FinanceClientIOError(f"No archived payload for '{self._ticker}'")
+
+        try:
+            json_data = self._archive.load_json(digest)
+        except FinanceClientIOError:
+            raise
+        except Exception as e:
+            raise FinanceClientInvalidData(f"Invalid archived payload {digest}") from e
+        else:
+            self._logger.info(f"Archived payload {digest} loaded")
+
+        return json_data
+
     @classmethod
     def _build_query_metadata_key(cls) -> str:
         """ Return metadata query key. """
@@ -112,11 +210,10 @@ class FinanceClient(ABC):
 
         pass
 
-    def _process_query_response(self, response: requests.Response) -> None:
+    def _process_query_response(self, json_data_downloaded: Dict) -> None:
         """ Preprocess query data. """
 
         try:
-            json_data_downloaded = response.json()
             self._json_metadata = json_data_downloaded[self._build_query_metadata_key()]
             self._json_data = json_data_downloaded[self._build_query_data_key()]
         except Exception as e:
@@ -151,3 +248,39 @@ class FinanceClient(ABC):
             raise FinanceClientIOError(f"Unable to write json data into file '{path2file}'") from e
 
         return path2file
+
+    def _arrow_arrays(self) -> Tuple[List[str], List[Any]]:
+        """ Return column names and Arrow arrays of the data frame.
+
+        A datetime index becomes a leading 'date' column. Numeric columns
+        are wrapped without copying their NumPy buffers.
+        """
+
+        assert self._data_frame is not None
+
+        if pa is None:
+            raise ImportError("Arrow export requires pyarrow (pip install pyarrow)")
+
+        names: List[str] = []
+        arrays: List[Any] = []
+        if isinstance(self._data_frame.index, pd.DatetimeIndex):
+            names.append("date")
+            arrays.append(pa.array(self._data_frame.index.values))
+        for name in self._data_frame.columns:
+            values = self._data_frame[name].to_numpy()
+            names.append(name)
+            arrays.append(pa.array(values, from_pandas=values.dtype == object))
+
+        return names, arrays
+
+    def to_arrow(self) -> Any:
+        """ Return pyarrow Table from json data. """
+
+        names, arrays = self._arrow_arrays()
+
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def __dataframe__(self, nan_as_null: bool = False, allow_copy: bool = True) -> Any:
+        """ Return dataframe interchange object (keeps the date index as a column). """
+
+        return self.to_arrow().__dataframe__(nan_as_null, allow_copy)
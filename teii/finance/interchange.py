@@ -0,0 +1,140 @@
+""" Arrow interchange of finance client collections """
+
+
+import numpy as np
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Union
+
+from teii.finance import FinanceClientIOError
+from teii.finance import FinanceClientParamError
+from teii.finance import FinanceClient
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+
+def _check_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Arrow export requires pyarrow (pip install pyarrow)")
+
+
+class FinanceClientCollection(Mapping[str, FinanceClient]):
+    """ Multi-ticker collection of finance clients exported as one Arrow table.
+
+        The table is in long format: a dictionary-encoded 'ticker' column
+        followed by the columns of each client. Each client becomes one
+        record batch that reuses the client's buffers.
+    """
+
+    def __init__(self, clients: Union[Mapping[str, FinanceClient], Iterable[FinanceClient]]) -> None:
+        """ FinanceClientCollection constructor. """
+
+        if isinstance(clients, Mapping):
+            self._clients: Dict[str, FinanceClient] = dict(clients)
+        else:
+            self._clients = {client.ticker: client for client in clients}
+
+    def __getitem__(self, ticker: str) -> FinanceClient:
+        return self._clients[ticker]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def record_batches(self) -> Iterator[Any]:
+        """ Yield one pyarrow RecordBatch per client. """
+
+        _check_pyarrow()
+
+        tickers = pa.array(list(self._clients), type=pa.string())
+        for position, client in enumerate(self._clients.values()):
+            names, arrays = client._arrow_arrays()
+            length = len(arrays[0]) if arrays else 0
+            ticker = pa.DictionaryArray.from_arrays(pa.array(np.full(length, position, dtype=np.int32)), tickers)
+            yield pa.RecordBatch.from_arrays([ticker] + arrays, names=["ticker"] + names)
+
+    def to_arrow(self) -> Any:
+        """ Return pyarrow Table with the data of every client.
+
+        Raises
+        ------
+        FinanceClientParamError
+            Si la colección está vacía
+        """
+
+        if not self._clients:
+            raise FinanceClientParamError("Empty client collection")
+
+        return pa.Table.from_batches(list(self.record_batches()))
+
+    def __dataframe__(self, nan_as_null: bool = False, allow_copy: bool = True) -> Any:
+        """ Return dataframe interchange object. """
+
+        return self.to_arrow().__dataframe__(nan_as_null, allow_copy)
+
+    def write_arrow_stream(self, sink: Any) -> int:
+        """ Write collection to 'sink' (path or file object) in Arrow IPC stream format.
+
+        Returns
+        -------
+        batches : int
+            devuelve el número de record batches escritos (uno por cliente)
+
+        Raises
+        ------
+        FinanceClientParamError
+            Si la colección está vacía
+        FinanceClientIOError
+            Si no es posible escribir en 'sink'
+        """
+
+        if not self._clients:
+            raise FinanceClientParamError("Empty client collection")
+
+        try:
+            if isinstance(sink, (str, Path)):
+                with pa.OSFile(str(sink), 'wb') as f:
+                    return self._write_batches(f)
+            return self._write_batches(sink)
+        except (IOError, PermissionError) as e:
+            raise FinanceClientIOError(f"Unable to write Arrow stream into '{sink}'") from e
+
+    def _write_batches(self, sink: Any) -> int:
+        batches = list(self.record_batches())
+        with pa.ipc.new_stream(sink, batches[0].schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+        return len(batches)
+
+    def write_feather(self, path2file: Union[str, Path]) -> Path:
+        """ Write collection into Feather (Arrow IPC file) 'path2file'. """
+
+        table = self.to_arrow()
+
+        try:
+            feather.write_feather(table, str(path2file), compression='uncompressed')
+        except (IOError, PermissionError) as e:
+            raise FinanceClientIOError(f"Unable to write Feather file '{path2file}'") from e
+
+        return Path(path2file)
+
+
+def read_arrow_stream(source: Any) -> Any:
+    """ Return pyarrow Table read from an Arrow IPC stream ('source' path or file object). """
+
+    _check_pyarrow()
+
+    try:
+        if isinstance(source, (str, Path)):
+            source = pa.memory_map(str(source))
+        with pa.ipc.open_stream(source) as reader:
+            return reader.read_all()
+    except (IOError, PermissionError) as e:
+        raise FinanceClientIOError(f"Unable to read Arrow stream from '{source}'") from e
@@ -0,0 +1,271 @@
+""" Background watchlist refresher """
+
+
+import collections
+import logging
+import threading
+import time
+
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Type, Union
+
+from teii.finance import FinanceClientParamError
+from teii.finance import FinanceClient
+from teii.finance import PayloadArchive
+from teii.finance import SharedTimeSeriesStore
+from teii.finance import TimeSeriesFinanceClient
+from teii.finance.exception import FinanceClientError
+
+
+class WatchlistRefresher:
+    """ Keep the clients of a watchlist fresh ahead of demand.
+
+        Tickers whose data is older than 'max_age' are refreshed, stalest and
+        most requested first, without exceeding the per-minute and per-day
+        request budgets of the Finance API. Refreshed clients replace the
+        published ones in a single assignment, so readers never wait for a
+        refresh and never see a half-built client. Tickers that fail are
+        retried with exponential backoff and after the stale ones, so dead
+        tickers cannot starve the rest of the watchlist.
+    """
+
+    def __init__(self, watchlist: Iterable[str],
+                 api_key: Optional[str] = None,
+                 client_class: Type[FinanceClient] = TimeSeriesFinanceClient,
+                 max_age: float = 12 * 60 * 60,
+                 retry_delay: float = 60,
+                 requests_per_minute: int = 5,
+                 requests_per_day: int = 500,
+                 archive: Optional[PayloadArchive] = None,
+                 store: Optional[SharedTimeSeriesStore] = None,
+                 clock: Callable[[], float] = time.time,
+                 logging_level: Union[int, str] = logging.WARNING) -> None:
+        """ WatchlistRefresher constructor.
+
+        'max_age' and 'retry_delay' (wait after a first failure, doubled after
+        each further one up to 'max_age') are given in seconds; 'clock'
+        returns the current time in seconds.
+        """
+
+        if requests_per_minute < 1 or requests_per_day < 1:
+            raise FinanceClientParamError("Request budgets must be positive")
+
+        self._api_key = api_key
+        self._client_class = client_class
+        self._max_age = max_age
+        self._retry_delay = retry_delay
+        self._requests_per_minute = requests_per_minute
+        self._requests_per_day = requests_per_day
+        self._archive = archive
+        self._store = store
+        self._clock = clock
+
+        self._logger = logging.getLogger(__name__)
+        self._logger.setLevel(logging_level)
+
+        self._watchlist: List[str] = []
+        self._clients: Dict[str, FinanceClient] = {}
+        self._refreshed: Dict[str, float] = {}
+        self._hits: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}
+        self._store_failures: Dict[str, int] = {}
+        self._failed: Dict[str, float] = {}
+        self._retries: Dict[str, int] = {}
+        self._requests: Deque[float] = collections.deque()
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        for ticker in watchlist:
+            self.add(ticker)
+
+    def add(self, ticker: str) -> None:
+        """ Add 'ticker' to the watchlist. """
+
+        with self._lock:
+            if ticker not in self._watchlist:
+                self._watchlist.append(ticker)
+                self._hits.setdefault(ticker, 0)
+
+    def remove(self, ticker: str) -> None:
+        """ Remove 'ticker' (and its published client) from the watchlist. """
+
+        with self._lock:
+            if ticker in self._watchlist:
+                self._watchlist.remove(ticker)
+            self._clients.pop(ticker, None)
+            self._refreshed.pop(ticker, None)
+            self._failed.pop(ticker, None)
+            self._retries.pop(ticker, None)
+
+    def get(self, ticker: str) -> Optional[FinanceClient]:
+        """ Return last published client for 'ticker' (None if not fetched yet).
+
+        Never blocks: the hit counter used for prioritization is updated
+        without locking, so it is approximate under heavy concurrency.
+        """
+
+        self._hits[ticker] = self._hits.get(ticker, 0) + 1
+
+        return self._clients.get(ticker)
+
+    def staleness(self) -> Dict[str, Optional[float]]:
+        """ Return seconds since the last refresh of each ticker (None if never refreshed). """
+
+        now = self._clock()
+        refreshed = dict(self._refreshed)
+
+        return {ticker: (now - refreshed[ticker]) if ticker in refreshed else None
+                for ticker in list(self._watchlist)}
+
+    def due(self) -> List[str]:
+        """ Return tickers pending refresh, highest priority first.
+
+        Priority grows with staleness (relative to 'max_age') and popularity;
+        tickers never fetched come first and tickers whose last refresh failed
+        come last, once their backoff has expired.
+        """
+
+        now = self._clock()
+        failed = dict(self._failed)
+        retries = dict(self._retries)
+
+        priorities = {}
+        for ticker, age in self.staleness().items():
+            if ticker in failed:
+                if now - failed[ticker] >= self._backoff(retries.get(ticker, 1)):
+                    priorities[ticker] = (2, -(now - failed[ticker]))
+            elif age is None:
+                priorities[ticker] = (0, 0.0)
+            elif age >= self._max_age:
+                priorities[ticker] = (1, -age / self._max_age * (1 + self._hits.get(ticker, 0)))
+
+        return sorted(priorities, key=lambda ticker: priorities[ticker])
+
+    def _backoff(self, retries: int) -> float:
+        """ Return seconds to wait after 'retries' consecutive failures. """
+
+        return min(self._retry_delay * 2 ** (retries - 1), self._max_age)
+
+    def _prune_requests(self, now: float) -> None:
+        while self._requests and now - self._requests[0] >= 24 * 60 * 60:
+            self._requests.popleft()
+
+    def _requests_since(self, start: float) -> int:
+        return sum(1 for timestamp in self._requests if timestamp > start)
+
+    def _acquire(self) -> bool:
+        """ Consume one request from the budget if available. """
+
+        with self._lock:
+            now = self._clock()
+            self._prune_requests(now)
+            if len(self._requests) >= self._requests_per_day:
+                return False
+            if self._requests_since(now - 60) >= self._requests_per_minute:
+                return False
+            self._requests.append(now)
+
+        return True
+
+    def refresh(self, ticker: str) -> bool:
+        """ Fetch 'ticker' and publish the new client; return True on success.
+
+        The request budget is only enforced by run_pending(). A fetched client
+        is published even if it cannot be written to the store; store errors
+        are logged and counted apart from fetch failures.
+        """
+
+        try:
+            client = self._client_class(ticker, self._api_key, archive=self._archive)
+        except FinanceClientError as e:
+            self._failures[ticker] = self._failures.get(ticker, 0) + 1
+            self._retries[ticker] = self._retries.get(ticker, 0) + 1
+            self._failed[ticker] = self._clock()
+            self._logger.warning(f"Refresh of '{ticker}' failed: {e}")
+            return False
+
+        # Publish atomically: readers see either the old or the new client
+        self._clients[ticker] = client
+        self._refreshed[ticker] = self._clock()
+        self._failed.pop(ticker, None)
+        self._retries.pop(ticker, None)
+        self._logger.info(f"'{ticker}' refreshed")
+
+        if self._store is not None:
+            try:
+                self._store.publish(ticker, client.to_pandas())
+            except FinanceClientError as e:
+                self._store_failures[ticker] = self._store_failures.get(ticker, 0) + 1
+                self._logger.warning(f"Publishing '{ticker}' to the store failed: {e}")
+
+        return True
+
+    def run_pending(self) -> List[str]:
+        """ Refresh due tickers while the request budget allows it.
+
+        Returns
+        -------
+        tickers : list
+            devuelve los símbolos refrescados con éxito
+        """
+
+        refreshed = []
+        for ticker in self.due():
+            if not self._acquire():
+                self._logger.info("Request budget exhausted")
+                break
+            if self.refresh(ticker):
+                refreshed.append(ticker)
+
+        return refreshed
+
+    def metrics(self) -> Dict[str, Union[int, float, None]]:
+        """ Return queue depth, budget usage and staleness metrics. """
+
+        staleness = [age for age in self.staleness().values() if age is not None]
+        with self._lock:
+            now = self._clock()
+            self._prune_requests(now)
+            requests_last_minute = self._requests_since(now - 60)
+            requests_last_day = len(self._requests)
+
+        return {'watchlist': len(self._watchlist),
+                'queue_depth': len(self.due()),
+                'never_refreshed': len(self._watchlist) - len(staleness),
+                'max_staleness': max(staleness) if staleness else None,
+                'requests_last_minute': requests_last_minute,
+                'requests_last_day': requests_last_day,
+                'failures': sum(self._failures.values()),
+                'store_failures': sum(self._store_failures.values())}
+
+    def _run(self, interval: float) -> None:
+        while not self._stop_event.is_set():
+            self.run_pending()
+            self._stop_event.wait(interval)
+
+    def start(self, interval: float = 1.0) -> None:
+        """ Start refreshing in a background thread every 'interval' seconds. """
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,),
+                                        name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ Stop background thread. """
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> 'WatchlistRefresher':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
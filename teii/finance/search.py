@@ -0,0 +1,305 @@
+""" Symbol Search Finance Client classes """
+
+
+import bisect
+import difflib
+import json
+import logging
+import pandas as pd
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from teii.finance import FinanceClientInvalidData
+from teii.finance import FinanceClientIOError
+from teii.finance import FinanceClient
+from teii.finance import PayloadArchive
+from teii.finance.cache import QueryCache
+
+
+class SymbolSearchFinanceClient(FinanceClient):
+    """ Wrapper around the AlphaVantage API for Symbol Search.
+
+        Source:
+            https://www.alphavantage.co/documentation/ (SYMBOL_SEARCH)
+    """
+
+    _data_field2name_type = {
+            "1. symbol":                ("symbol",       "str"),
+            "2. name":                  ("name",         "str"),
+            "3. type":                  ("type",         "str"),
+            "4. region":                ("region",       "str"),
+            "5. marketOpen":            ("market_open",  "str"),
+            "6. marketClose":           ("market_close", "str"),
+            "7. timezone":              ("timezone",     "str"),
+            "8. currency":              ("currency",     "str"),
+            "9. matchScore":            ("match_score",  "float")
+        }
+
+    def __init__(self, keywords: str,
+                 api_key: Optional[str] = None,
+                 logging_level: Union[int, str] = logging.WARNING,
+                 archive: Optional[PayloadArchive] = None,
+                 from_archive: bool = False) -> None:
+        """ SymbolSearchFinanceClient constructor. """
+
+        super().__init__(keywords, api_key, logging_level, archive=archive, from_archive=from_archive)
+
+        self._build_data_frame()
+        self._logger.info("Objeto de tipo SymbolSearchFinanceClient creado")
+
+    def _build_data_frame(self) -> None:
+        """ Build Panda's DataFrame and format data. """
+
+        try:
+            data_frame = pd.DataFrame.from_records(self._json_data,
+                                                   columns=list(self._data_field2name_type.keys()))
+
+            data_frame = data_frame.rename(columns={key: name_type[0]
+                                                    for key, name_type in self._data_field2name_type.items()})
+
+            self._data_frame = data_frame.astype(dtype={name_type[0]: name_type[1]
+                                                        for key, name_type in self._data_field2name_type.items()})
+        except Exception as e:
+            raise FinanceClientInvalidData("Datos inválidos para la construcción del dataframe") from e
+        else:
+            self._logger.info("Data frame construido")
+
+    @classmethod
+    def _build_query_function(cls) -> str:
+        """ Return API query function. """
+
+        return "SYMBOL_SEARCH"
+
+    def _build_base_query_url_params(self) -> str:
+        """ Return base query URL parameters.
+
+        Parameters are dependent on the query type:
+            https://www.alphavantage.co/documentation/
+        URL format:
+            https://www.alphavantage.co/query?function=SYMBOL_SEARCH&keywords=KEYWORDS&apikey=API_KEY
+        """
+
+        return f"function={self._build_query_function()}&keywords={quote(self._ticker)}&apikey={self._api_key}"
+
+    @classmethod
+    def _build_query_data_key(cls) -> str:
+        """ Return data query key. """
+
+        return "bestMatches"
+
+    def _process_query_response(self, json_data_downloaded: Dict) -> None:
+        """ Preprocess query data.
+
+        Symbol search responses have no metadata field.
+        """
+
+        try:
+            self._json_metadata = {}
+            self._json_data = json_data_downloaded[self._build_query_data_key()]
+        except Exception as e:
+            raise FinanceClientInvalidData("Invalid data") from e
+        else:
+            self._logger.info("Data field found")
+
+        self._logger.info(f"Data: '{json.dumps(self._json_data)[0:218]}...'")
+
+    def _validate_query_data(self) -> None:
+        """ Validate query data. """
+
+        try:
+            assert isinstance(self._json_data, list)
+            assert all("1. symbol" in match for match in self._json_data)
+        except Exception as e:
+            raise FinanceClientInvalidData("Data field '1. symbol' not found") from e
+        else:
+            self._logger.info(f"{len(self._json_data)} matches found for '{self._ticker}'")
+
+
+class SymbolIndex:
+    """ Local symbol index for offline prefix and fuzzy lookups.
+
+        Symbols and the words of company names are kept in sorted lists, so
+        prefix queries are answered with a binary search. Fuzzy queries only
+        compare against the words sharing the first letter of the query.
+        Queries the Finance API found no match for are remembered (up to
+        'miss_cache_size'), so lookup() does not repeat them, nor any longer
+        query starting with them, until new records are added.
+    """
+
+    def __init__(self, logging_level: Union[int, str] = logging.WARNING,
+                 miss_cache_size: int = 1024) -> None:
+        """ SymbolIndex constructor. """
+
+        self._logger = logging.getLogger(__name__)
+        self._logger.setLevel(logging_level)
+
+        self._records: Dict[str, Dict] = {}
+        self._symbols: List[str] = []
+        self._words: List[Tuple[str, str]] = []
+        self._dirty = False
+        self._api_misses = QueryCache(miss_cache_size)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and symbol.upper() in self._records
+
+    @classmethod
+    def from_listing_csv(cls, path2file: Union[str, Path],
+                         logging_level: Union[int, str] = logging.WARNING) -> 'SymbolIndex':
+        """ Build index from an Alpha Vantage LISTING_STATUS csv file. """
+
+        try:
+            data_frame = pd.read_csv(path2file, keep_default_na=False)
+        except (IOError, PermissionError) as e:
+            raise FinanceClientIOError(f"Unable to read listing file '{path2file}'") from e
+
+        index = cls(logging_level)
+        index.add(data_frame)
+
+        return index
+
+    def add(self, data_frame: pd.DataFrame) -> int:
+        """ Add (or update) the records of 'data_frame' and return how many were added.
+
+        The data frame needs at least 'symbol' and 'name' columns, as produced
+        by SymbolSearchFinanceClient.to_pandas() or a LISTING_STATUS csv file.
+        """
+
+        try:
+            records = data_frame.to_dict(orient='records')
+            for record in records:
+                record['symbol'] = str(record['symbol']).upper()
+                record['name'] = str(record['name'])
+        except Exception as e:
+            raise FinanceClientInvalidData("Symbol records need 'symbol' and 'name' fields") from e
+
+        for record in records:
+            self._records[record['symbol']] = record
+        self._dirty = True
+        self._api_misses.clear()
+        self._logger.info(f"{len(records)} symbols added to index")
+
+        return len(records)
+
+    def _build(self) -> None:
+        """ Rebuild sorted lookup lists after additions. """
+
+        if not self._dirty:
+            return
+
+        self._symbols = sorted(self._records)
+        self._words = sorted({(word, symbol)
+                              for symbol, record in self._records.items()
+                              for word in record['name'].lower().split()})
+        self._dirty = False
+
+    def _prefix_symbols(self, prefix: str, limit: int) -> List[str]:
+        prefix = prefix.upper()
+        found: List[str] = []
+        for position in range(bisect.bisect_left(self._symbols, prefix), len(self._symbols)):
+            symbol = self._symbols[position]
+            if not symbol.startswith(prefix) or len(found) == limit:
+                break
+            found.append(symbol)
+
+        return found
+
+    def _prefix_words(self, prefix: str, limit: int) -> List[str]:
+        prefix = prefix.lower()
+        found: List[str] = []
+        for position in range(bisect.bisect_left(self._words, (prefix, '')), len(self._words)):
+            word, symbol = self._words[position]
+            if not word.startswith(prefix) or len(found) == limit:
+                break
+            if symbol not in found:
+                found.append(symbol)
+
+        return found
+
+    def _fuzzy_words(self, query: str, limit: int, cutoff: float) -> List[str]:
+        query = query.lower()
+        start = bisect.bisect_left(self._words, (query[0], ''))
+        stop = bisect.bisect_left(self._words, (chr(ord(query[0]) + 1), ''))
+        candidates = self._words[start:stop]
+        words = difflib.get_close_matches(query, sorted({word for word, _ in candidates}), limit, cutoff)
+
+        found: List[str] = []
+        for word in words:
+            for position in range(bisect.bisect_left(candidates, (word, '')), len(candidates)):
+                candidate, symbol = candidates[position]
+                if candidate != word:
+                    break
+                if symbol not in found:
+                    found.append(symbol)
+
+        return found[:limit]
+
+    def search(self, query: str, limit: int = 10, cutoff: float = 0.75) -> List[Dict]:
+        """ Return up to 'limit' records matching 'query' without network access.
+
+        Parameters
+        ----------
+        query : str
+            prefijo del símbolo o de alguna palabra del nombre de la empresa
+        limit : int
+            número máximo de resultados
+        cutoff : float
+            similitud mínima (entre 0 y 1) para las búsquedas aproximadas por nombre
+
+        Returns
+        -------
+        records : list
+            devuelve los registros cuyo símbolo empieza por 'query', seguidos de aquellos
+            con alguna palabra del nombre que empieza por 'query' o, si no hay ninguno,
+            de aquellos con alguna palabra del nombre parecida a 'query'
+        """
+
+        query = query.strip()
+        if not query:
+            return []
+
+        self._build()
+
+        symbols = self._prefix_symbols(query, limit)
+        for symbol in self._prefix_words(query, limit):
+            if symbol not in symbols:
+                symbols.append(symbol)
+        if not symbols:
+            symbols = self._fuzzy_words(query, limit, cutoff)
+
+        return [self._records[symbol] for symbol in symbols[:limit]]
+
+    def _known_api_miss(self, query: str) -> bool:
+        """ Return True if the Finance API found no match for 'query' or one of its prefixes. """
+
+        query = query.strip().lower()
+
+        return any(self._api_misses.get(query[:length])[0] for length in range(1, len(query) + 1))
+
+    def lookup(self, query: str,
+               api_key: Optional[str] = None,
+               limit: int = 10,
+               archive: Optional[PayloadArchive] = None) -> List[Dict]:
+        """ Return records matching 'query', querying the Finance API only on index misses.
+
+        API results are added to the index, so later lookups are answered offline.
+        If 'archive' is given, the raw API responses are archived.
+        """
+
+        records = self.search(query, limit)
+        if records or self._known_api_miss(query):
+            return records
+
+        self._logger.info(f"Symbol index miss for '{query}', querying Finance API")
+        client = SymbolSearchFinanceClient(query, api_key, archive=archive)
+        data_frame = client.to_pandas()
+        if data_frame.empty:
+            self._api_misses.put(query.strip().lower(), True)
+            return []
+        self.add(data_frame)
+
+        return [self._records[symbol] for symbol in data_frame['symbol'].str.upper()[:limit]]
@@ -0,0 +1,320 @@
+""" Shared memory-mapped time series store """
+
+
+import contextlib
+import errno
+import json
+import logging
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from teii.finance import FinanceClientIOError
+from teii.finance import FinanceClientParamError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+
+class SharedTimeSeries:
+    """ Read-only view over a published time series version.
+
+        Every array is memory-mapped from the store, so all the processes
+        attached to the same version share the same physical pages.
+    """
+
+    def __init__(self, ticker: str, version: int,
+                 index: np.ndarray,
+                 prices: np.ndarray,
+                 volume: np.ndarray,
+                 price_columns: Sequence[str],
+                 store: 'SharedTimeSeriesStore') -> None:
+        """ SharedTimeSeries constructor. """
+
+        self._ticker = ticker
+        self._version = version
+        self._index = pd.DatetimeIndex(index)
+        self._prices = prices
+        self._volume = volume
+        self._price_columns = list(price_columns)
+        self._store = store
+
+    @property
+    def ticker(self) -> str:
+        """ Return ticker. """
+
+        return self._ticker
+
+    @property
+    def version(self) -> int:
+        """ Return attached version. """
+
+        return self._version
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """ Return weekly date index. """
+
+        return self._index
+
+    def columns(self) -> List[str]:
+        """ Return available column names. """
+
+        return self._price_columns + ['volume']
+
+    def array(self, name: str) -> np.ndarray:
+        """ Return read-only NumPy view of column 'name'. """
+
+        if name == 'volume':
+            return self._volume
+        try:
+            row = self._price_columns.index(name)
+        except ValueError as e:
+            raise FinanceClientParamError(f"Unknown column '{name}'") from e
+
+        return self._prices[row]
+
+    def series(self, name: str) -> pd.Series:
+        """ Return read-only pandas view of column 'name'. """
+
+        return pd.Series(self.array(name), index=self._index, name=name, copy=False)
+
+    def prices(self) -> pd.DataFrame:
+        """ Return read-only pandas view of all the float columns. """
+
+        return pd.DataFrame(self._prices.T, index=self._index, columns=self._price_columns, copy=False)
+
+    def is_current(self) -> bool:
+        """ Return True if no newer version has been published. """
+
+        return self._store.current_version(self._ticker) == self._version
+
+
+class SharedTimeSeriesStore:
+    """ Publish parsed time series once and attach them from any process.
+
+        Layout:
+            ROOT/TICKER/CURRENT             pointer to the current version
+            ROOT/TICKER/vNNNNNN/index.npy   weekly dates (datetime64[ns])
+            ROOT/TICKER/vNNNNNN/prices.npy  float columns, one row per column
+            ROOT/TICKER/vNNNNNN/volume.npy  volume column (int64)
+
+        Versions are immutable: a refresh writes a new version directory and
+        atomically replaces the CURRENT pointer, so attached readers keep
+        their mappings untouched. Concurrent publishers (threads or
+        processes) take distinct version numbers, and CURRENT is updated
+        under a lock file (where fcntl is available) that never lets it
+        go back to an older version.
+    """
+
+    _price_columns = ('open', 'high', 'low', 'close', 'aclose', 'dividend')
+
+    _pointer_name = 'CURRENT'
+
+    _lock_name = '.lock'
+
+    _max_publish_attempts = 100
+
+    def __init__(self, root: Union[str, Path],
+                 logging_level: Union[int, str] = logging.WARNING) -> None:
+        """ SharedTimeSeriesStore constructor. """
+
+        self._root = Path(root)
+        self._logger = logging.getLogger(__name__)
+        self._logger.setLevel(logging_level)
+
+        try:
+            self._root.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise FinanceClientIOError(f"Unable to create store directory '{self._root}'") from e
+
+    def _ticker_path(self, ticker: str) -> Path:
+        return self._root / ticker
+
+    @staticmethod
+    def _version_name(version: int) -> str:
+        return f"v{version:06d}"
+
+    def _read_pointer(self, ticker: str) -> Optional[Dict]:
+        try:
+            with open(self._ticker_path(ticker) / self._pointer_name) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise FinanceClientIOError(f"Unable to read current version of '{ticker}'") from e
+
+    @contextlib.contextmanager
+    def _pointer_lock(self, ticker: str) -> Iterator[None]:
+        """ Hold exclusive lock on the CURRENT pointer of 'ticker' (no-op without fcntl). """
+
+        with open(self._ticker_path(ticker) / self._lock_name, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def current_version(self, ticker: str) -> Optional[int]:
+        """ Return current version of 'ticker' (None if never published). """
+
+        pointer = self._read_pointer(ticker)
+
+        return None if pointer is None else pointer['version']
+
+    def versions(self, ticker: str) -> List[int]:
+        """ Return versions of 'ticker' stored on disk, oldest first (published or not). """
+
+        return sorted(int(path.name[1:]) for path in self._ticker_path(ticker).glob('v[0-9]*') if path.is_dir())
+
+    def tickers(self) -> List[str]:
+        """ Return published tickers. """
+
+        return sorted(path.parent.name for path in self._root.glob(f"*/{self._pointer_name}"))
+
+    def publish(self, ticker: str, data_frame: pd.DataFrame) -> int:
+        """ Publish 'data_frame' as a new version of 'ticker'.
+
+        Parameters
+        ----------
+        ticker : str
+            símbolo bajo el que se publica la serie
+        data_frame : pandas.DataFrame
+            data frame con el formato de TimeSeriesFinanceClient.to_pandas()
+
+        Returns
+        -------
+        version : int
+            versión publicada (no pasa a ser la actual si otro proceso ya publicó una posterior)
+
+        Raises
+        ------
+        FinanceClientParamError
+            Si faltan columnas en el data frame
+        FinanceClientIOError
+            Si no es posible escribir la nueva versión
+        """
+
+        try:
+            index = np.ascontiguousarray(data_frame.index.values.astype('datetime64[ns]'))
+            prices = np.ascontiguousarray(data_frame[list(self._price_columns)].to_numpy(dtype='float64').T)
+            volume = np.ascontiguousarray(data_frame['volume'].to_numpy(dtype='int64'))
+        except Exception as e:
+            raise FinanceClientParamError(f"Invalid data frame for '{ticker}'") from e
+
+        ticker_path = self._ticker_path(ticker)
+        try:
+            ticker_path.mkdir(parents=True, exist_ok=True)
+            tmp_path = Path(tempfile.mkdtemp(prefix='.version.', suffix='.tmp', dir=ticker_path))
+        except OSError as e:
+            raise FinanceClientIOError(f"Unable to publish new version of '{ticker}'") from e
+
+        try:
+            np.save(tmp_path / 'index.npy', index)
+            np.save(tmp_path / 'prices.npy', prices)
+            np.save(tmp_path / 'volume.npy', volume)
+        except OSError as e:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise FinanceClientIOError(f"Unable to publish new version of '{ticker}'") from e
+
+        # Numbered after every version on disk, so that a version left behind
+        # by a failed publish is never overwritten; a concurrent publisher
+        # that takes the same number first makes the rename fail, and the
+        # next number is tried
+        version = max(self.versions(ticker) + [self.current_version(ticker) or 0]) + 1
+        for attempt in range(self._max_publish_attempts):
+            version_path = ticker_path / self._version_name(version)
+            try:
+                os.rename(tmp_path, version_path)
+            except OSError as e:
+                if e.errno not in (errno.EEXIST, errno.ENOTEMPTY) or attempt == self._max_publish_attempts - 1:
+                    shutil.rmtree(tmp_path, ignore_errors=True)
+                    raise FinanceClientIOError(f"Unable to publish version {version} of '{ticker}'") from e
+                version += 1
+            else:
+                break
+
+        try:
+            with self._pointer_lock(ticker):
+                current = self.current_version(ticker)
+                if current is not None and current > version:
+                    self._logger.info(f"Published '{ticker}' version {version}, but version {current} is newer")
+                    return version
+
+                pointer = {'version': version,
+                           'columns': list(self._price_columns),
+                           'rows': len(index)}
+                tmp_pointer = ticker_path / f".{self._pointer_name}.{os.getpid()}.tmp"
+                with open(tmp_pointer, 'w') as f:
+                    json.dump(pointer, f)
+                os.replace(tmp_pointer, ticker_path / self._pointer_name)
+        except OSError as e:
+            shutil.rmtree(version_path, ignore_errors=True)
+            raise FinanceClientIOError(f"Unable to publish version {version} of '{ticker}'") from e
+        else:
+            self._logger.info(f"Published '{ticker}' version {version} ({len(index)} rows)")
+
+        return version
+
+    def attach(self, ticker: str, version: Optional[int] = None) -> SharedTimeSeries:
+        """ Attach read-only view of 'ticker' (current version by default).
+
+        Raises
+        ------
+        FinanceClientParamError
+            Si no existe la versión solicitada
+        FinanceClientIOError
+            Si no es posible mapear los ficheros de la versión
+        """
+
+        pointer = self._read_pointer(ticker)
+        if pointer is None:
+            raise FinanceClientParamError(f"Ticker '{ticker}' not published")
+        if version is None:
+            version = pointer['version']
+
+        version_path = self._ticker_path(ticker) / self._version_name(version)
+        if not version_path.is_dir():
+            raise FinanceClientParamError(f"Version {version} of '{ticker}' not found")
+
+        try:
+            index = np.load(version_path / 'index.npy', mmap_mode='r')
+            prices = np.load(version_path / 'prices.npy', mmap_mode='r')
+            volume = np.load(version_path / 'volume.npy', mmap_mode='r')
+        except (OSError, ValueError) as e:
+            raise FinanceClientIOError(f"Unable to attach version {version} of '{ticker}'") from e
+        else:
+            self._logger.info(f"Attached '{ticker}' version {version}")
+
+        return SharedTimeSeries(ticker, version, index, prices, volume, pointer['columns'], self)
+
+    def prune(self, ticker: str, keep: int = 2) -> List[int]:
+        """ Remove all but the 'keep' most recent versions of 'ticker'.
+
+        Readers attached to a removed version keep their mappings on POSIX
+        systems; versions that cannot be removed are left for a later call.
+        """
+
+        if keep < 1:
+            raise FinanceClientParamError("At least one version must be kept")
+
+        versions = self.versions(ticker)
+        removed = []
+        for version in versions[:-keep]:
+            try:
+                shutil.rmtree(self._ticker_path(ticker) / self._version_name(version))
+            except OSError:
+                self._logger.warning(f"Unable to remove version {version} of '{ticker}'")
+            else:
+                removed.append(version)
+
+        return removed
@@ -3,13 +3,16 @@
 
 import datetime as dt
 import logging
+import numpy as np
 import pandas as pd
 
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 
 from teii.finance import FinanceClientParamError
 from teii.finance import FinanceClientInvalidData
 from teii.finance import FinanceClient
+from teii.finance import PayloadArchive
+from teii.finance.cache import QueryCache, memoized_query
 
 
 class TimeSeriesFinanceClient(FinanceClient):
@@ -29,12 +32,27 @@ class TimeSeriesFinanceClient(FinanceClient):
             "7. dividend amount":       ("dividend", "float")
         }
 
+    _resample_freq2period = {
+            "monthly":      "M",
+            "quarterly":    "Q",
+            "yearly":       "Y"
+        }
+
     def __init__(self, ticker: str,
                  api_key: Optional[str] = None,
-                 logging_level: Union[int, str] = logging.WARNING) -> None:
-        """ TimeSeriesFinanceClient constructor. """
+                 logging_level: Union[int, str] = logging.WARNING,
+                 archive: Optional[PayloadArchive] = None,
+                 from_archive: bool = False,
+                 cache_size: int = 128) -> None:
+        """ TimeSeriesFinanceClient constructor.
+
+        Results of the query methods are memoized in a LRU cache of 'cache_size'
+        entries (0 disables it), which is emptied whenever data is refreshed.
+        """
 
-        super().__init__(ticker, api_key, logging_level)
+        self._query_cache = QueryCache(cache_size)
+
+        super().__init__(ticker, api_key, logging_level, archive=archive, from_archive=from_archive)
 
         self._build_data_frame()
         self._logger.info("Objeto de tipo TimeSeriesFinanceClient creado")
@@ -68,6 +86,16 @@ class TimeSeriesFinanceClient(FinanceClient):
         else:
             self._logger.info("Data frame construido")
 
+        # Cached results were computed from the previous data frame
+        self._resample_cache: Dict[str, pd.DataFrame] = {}
+        self._query_cache.clear()
+
+    @classmethod
+    def _build_query_function(cls) -> str:
+        """ Return API query function. """
+
+        return "TIME_SERIES_WEEKLY_ADJUSTED"
+
     def _build_base_query_url_params(self) -> str:
         """ Return base query URL parameters.
 
@@ -78,7 +106,7 @@ class TimeSeriesFinanceClient(FinanceClient):
         """
 
         self._logger.info("Obteniendo parámetros para base query URL solicitada.")
-        return f"function=TIME_SERIES_WEEKLY_ADJUSTED&symbol={self._ticker}&outputsize=full&apikey={self._api_key}"
+        return f"function={self._build_query_function()}&symbol={self._ticker}&outputsize=full&apikey={self._api_key}"
 
     @classmethod
     def _build_query_data_key(cls) -> str:
@@ -96,6 +124,7 @@ class TimeSeriesFinanceClient(FinanceClient):
         else:
             self._logger.info(f"Metadata key '2. Symbol' = '{self._ticker}' found")
 
+    @memoized_query
     def weekly_price(self,
                      from_date: Optional[dt.date] = None,
                      to_date: Optional[dt.date] = None) -> pd.Series:
@@ -139,6 +168,7 @@ class TimeSeriesFinanceClient(FinanceClient):
 
         return series
 
+    @memoized_query
     def weekly_volume(self,
                       from_date: Optional[dt.date] = None,
                       to_date: Optional[dt.date] = None) -> pd.Series:
@@ -180,6 +210,7 @@ class TimeSeriesFinanceClient(FinanceClient):
 
         return series
 
+    @memoized_query
     def yearly_dividends(self,
                          from_year: Optional[dt.date] = None,
                          to_year: Optional[dt.date] = None) -> pd.Series:
@@ -205,7 +236,7 @@ class TimeSeriesFinanceClient(FinanceClient):
 
         assert self._data_frame is not None
 
-        series = self._data_frame.groupby(pd.Grouper(freq='YS'))['dividend'].sum()
+        series = self._resample_bars("yearly")['dividend']
 
         if from_year is not None and to_year is not None:
             try:
@@ -219,11 +250,9 @@ class TimeSeriesFinanceClient(FinanceClient):
         else:
             self._logger.info("Dividendos obtenidos de todos los años.")
 
-        series.index = pd.to_datetime(series.index, format='%Y-%m-%d').strftime('%Y')
-        series.index = pd.to_datetime(series.index)
-
-        return series
+        return series.copy()
 
+    @memoized_query
     def highest_weekly_variation(self,
                                  from_date: Optional[dt.date] = None,
                                  to_date: Optional[dt.date] = None) -> pd.Series:
@@ -249,9 +278,7 @@ class TimeSeriesFinanceClient(FinanceClient):
 
         assert self._data_frame is not None
 
-        self._data_frame['high-low'] = self._data_frame['high'] - self._data_frame['low']
-
-        series = self._data_frame[['high', 'low', 'high-low']]
+        series = self._data_frame[['high', 'low']].assign(**{'high-low': self._data_frame['high'] - self._data_frame['low']})
 
         if from_date is not None and to_date is not None:
             try:
@@ -274,3 +301,93 @@ class TimeSeriesFinanceClient(FinanceClient):
         tupla = (fecha, fila.iloc[0, 0], fila.iloc[0, 1], fila.iloc[0, 2])
 
         return tupla
+
+    def _resample_bars(self, freq: str) -> pd.DataFrame:
+        """ Return cached OHLCV bars for 'freq', computing them if needed. """
+
+        assert self._data_frame is not None
+
+        bars = self._resample_cache.get(freq)
+        if bars is not None:
+            self._logger.info(f"Barras '{freq}' obtenidas de la caché.")
+            return bars
+
+        if self._data_frame.empty:
+            bars = self._data_frame.iloc[:0].copy()
+        else:
+            # Weekly rows are sorted, so every period is a contiguous run of rows
+            periods = self._data_frame.index.to_period(self._resample_freq2period[freq])
+            codes = periods.asi8
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+            lasts = np.r_[starts[1:], len(codes)] - 1
+
+            columns = {name: self._data_frame[name].to_numpy() for name, _ in self._data_field2name_type.values()}
+            bars = pd.DataFrame({"open":     columns["open"][starts],
+                                 "high":     np.maximum.reduceat(columns["high"], starts),
+                                 "low":      np.minimum.reduceat(columns["low"], starts),
+                                 "close":    columns["close"][lasts],
+                                 "aclose":   columns["aclose"][lasts],
+                                 "volume":   np.add.reduceat(columns["volume"], starts),
+                                 "dividend": np.add.reduceat(columns["dividend"], starts)},
+                                index=pd.DatetimeIndex(periods[starts].to_timestamp(), freq=None))
+
+        self._resample_cache[freq] = bars
+        self._logger.info(f"Barras '{freq}' calculadas ({len(bars)} periodos).")
+
+        return bars
+
+    def cache_info(self) -> Dict[str, int]:
+        """ Return hit/miss statistics of the query result cache. """
+
+        return self._query_cache.info()
+
+    def resample(self,
+                 freq: str = "monthly",
+                 from_date: Optional[dt.date] = None,
+                 to_date: Optional[dt.date] = None) -> pd.DataFrame:
+        """ Return OHLCV bars for 'freq' from 'from_date' to 'to_date'.
+
+        Parameters
+        ----------
+        freq : str
+            frecuencia de las barras: 'monthly', 'quarterly' o 'yearly'
+        from_date : datetime.date
+            parámetro que indica desde qué fecha (se cogerá su periodo) de inicio queremos buscar (opcional)
+        to_date : datetime.date
+            parámetro que indica hasta qué fecha (se cogerá su periodo) final queremos buscar (opcional)
+
+        Returns
+        -------
+        data_frame : pandas.DataFrame
+            devuelve un data frame indexado por el inicio de cada periodo con la primera apertura, el
+            máximo, el mínimo, el último cierre (y cierre ajustado) y la suma de volúmenes y dividendos
+
+        Raises
+        ------
+        FinanceClientParamError
+            Si la frecuencia no está soportada o la fecha from_date es posterior a to_date
+        """
+
+        try:
+            assert freq in self._resample_freq2period
+        except Exception as e:
+            raise FinanceClientParamError(f"Frecuencia '{freq}' no soportada") from e
+
+        bars = self._resample_bars(freq)
+
+        if from_date is not None and to_date is not None:
+            try:
+                assert from_date <= to_date
+
+            except Exception as e:
+                raise FinanceClientParamError("Error en los parámetros introducidos") from e
+            else:
+                period = self._resample_freq2period[freq]
+                from_period = pd.Timestamp(from_date).to_period(period).to_timestamp()
+                to_period = pd.Timestamp(to_date).to_period(period).to_timestamp()
+                self._logger.info(f"Barras '{freq}' filtradas desde {from_date} hasta {to_date}.")
+                bars = bars.loc[from_period:to_period]
+        else:
+            self._logger.info(f"Barras '{freq}' obtenidas de todos los periodos.")
+
+        return bars.copy()
@@ -20,15 +20,24 @@ def mocked_requests():
     def mocked_get(url):
         response = mock.Mock()
         response.status_code = 200
-        if 'IBM' in url:
+        if 'SYMBOL_SEARCH' in url:
+            if 'Pfizer' in url:
+                json_filename = 'SYMBOL_SEARCH.Pfizer.json'
+            elif 'NOMATCH' in url:
+                json_filename = 'SYMBOL_SEARCH.NOMATCH.json'
+            else:
+                json_filename = 'NODATA.json'
+        elif 'IBM' in url:
             json_filename = 'TIME_SERIES_WEEKLY_ADJUSTED.IBM.json'
+        elif 'AAPL' in url:
+            json_filename = 'TIME_SERIES_WEEKLY_ADJUSTED.AAPL.json'
         elif 'NODATA' in url:
             json_filename = 'NODATA.json'
         else:
             raise ValueError('Ticker no soportado')
-        with resources.open_text('teii.finance.data', json_filename) as json_fid:
-            json_data = json.load(json_fid)
-        response.json.return_value = json_data
+        json_payload = resources.read_binary('teii.finance.data', json_filename)
+        response.content = json_payload
+        response.json.return_value = json.loads(json_payload)
         return response
 
     requests = mock.Mock()
@@ -83,3 +92,10 @@ def pandas_series_IBM_dividends_filtered():
         df = pd.read_csv(path2csv, index_col=0, parse_dates=True)
         ds = df['dividend']
     return ds
+
+
+@fixture(scope='package')
+def symbol_index_listing():
+    with resources.path('teii.finance.data', 'LISTING_STATUS.csv') as path2csv:
+        index = teii.finance.SymbolIndex.from_listing_csv(path2csv)
+    return index
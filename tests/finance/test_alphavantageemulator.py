@@ -0,0 +1,82 @@
+""" Unit tests for teii.finance.emulator module """
+
+
+import pytest
+import requests
+import teii.finance.finance
+
+from teii.finance import AlphaVantageEmulator
+from teii.finance import FinanceClientAPIError
+from teii.finance import FinanceClientInvalidData
+from teii.finance import FinanceClientParamError
+from teii.finance import TimeSeriesFinanceClient
+from teii.finance import synthetic_weekly_adjusted
+
+
+@pytest.fixture
+def real_requests(monkeypatch):
+    monkeypatch.setattr(teii.finance.finance, 'requests', requests)
+
+
+def test_synthetic_deterministic():
+    json_data = synthetic_weekly_adjusted("XYZ", weeks=50)
+
+    assert json_data == synthetic_weekly_adjusted("XYZ", weeks=50)
+    assert json_data != synthetic_weekly_adjusted("XYZ", weeks=50, seed=1)
+    assert len(json_data["Weekly Adjusted Time Series"]) == 50
+    assert next(iter(json_data["Weekly Adjusted Time Series"])) == "2022-02-11"
+
+
+def test_synthetic_invalid_weeks():
+    with pytest.raises(FinanceClientParamError):
+        synthetic_weekly_adjusted("XYZ", weeks=0)
+
+
+def test_emulator_client(api_key_str,
+                         real_requests,
+                         monkeypatch):
+    with AlphaVantageEmulator(weeks=520) as emulator:
+        monkeypatch.setenv("TEII_FINANCE_BASE_URL", emulator.base_url)
+
+        fc = TimeSeriesFinanceClient("SYN1", api_key_str)
+        df = fc.to_pandas()
+
+        assert df.shape[0] == 520
+        assert (df['high'] >= df['low']).all()
+        assert (df['aclose'] <= df['close'] + 1e-4).all()
+        assert fc.weekly_price().equals(TimeSeriesFinanceClient("SYN1", api_key_str).weekly_price())
+        assert emulator.stats()['served'] == 2
+
+
+def test_emulator_errors(api_key_str,
+                         real_requests,
+                         monkeypatch):
+    with AlphaVantageEmulator(weeks=10, error_rate=1.0) as emulator:
+        monkeypatch.setenv("TEII_FINANCE_BASE_URL", emulator.base_url)
+
+        with pytest.raises(FinanceClientAPIError):
+            TimeSeriesFinanceClient("SYN1", api_key_str)
+
+        assert emulator.stats()['errors'] == 1
+
+
+def test_emulator_throttle(api_key_str,
+                           real_requests,
+                           monkeypatch):
+    with AlphaVantageEmulator(weeks=10, requests_per_minute=1) as emulator:
+        monkeypatch.setenv("TEII_FINANCE_BASE_URL", emulator.base_url)
+
+        TimeSeriesFinanceClient("SYN1", api_key_str)
+        with pytest.raises(FinanceClientInvalidData):
+            TimeSeriesFinanceClient("SYN1", api_key_str)
+
+        assert "Note" in requests.get(f"{emulator.base_url}function=TIME_SERIES_WEEKLY_ADJUSTED&symbol=SYN1&apikey=x").json()
+        assert emulator.stats()['throttled'] == 2
+
+
+def test_emulator_invalid_call():
+    with AlphaVantageEmulator(weeks=10, invalid_tickers=["BAD"]) as emulator:
+        response = requests.get(f"{emulator.base_url}function=TIME_SERIES_WEEKLY_ADJUSTED&symbol=BAD&apikey=x")
+
+        assert response.status_code == 200
+        assert "Error Message" in response.json()
@@ -0,0 +1,94 @@
+""" Unit tests for teii.finance.analytics module """
+
+
+import datetime as dt
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas.testing import assert_frame_equal
+
+from teii.finance import FinanceClientParamError
+from teii.finance import TimeSeriesFinanceClient
+from teii.finance import align_prices
+from teii.finance import correlation_matrix
+from teii.finance import covariance_matrix
+
+
+@pytest.fixture
+def random_prices():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-02", periods=200, freq="W-FRI")
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (200, 7)), axis=0)),
+                          index=index, columns=[f"T{i}" for i in range(7)])
+    prices = prices.mask(rng.random(prices.shape) < 0.1)
+    prices.iloc[:120, 6] = np.nan
+    return {ticker: prices[ticker].dropna() for ticker in prices.columns}
+
+
+def test_align_prices(api_key_str,
+                      mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    df = align_prices({"IBM": fc, "IBM2": fc.weekly_price().iloc[::2]}, dt.date(2019, 1, 1), dt.date(2021, 12, 31))
+
+    assert list(df.columns) == ["IBM", "IBM2"]
+    assert df.shape[0] == 157
+    assert df["IBM2"].count() < df["IBM"].count()
+
+
+def test_align_prices_invalid_dates(random_prices):
+    with pytest.raises(FinanceClientParamError):
+        align_prices(random_prices, dt.date(2020, 10, 10), dt.date(2020, 10, 9))
+
+
+@pytest.mark.parametrize("block_size, n_jobs", [(256, 1), (2, 1), (3, 4)])
+def test_correlation_matrix(random_prices, block_size, n_jobs):
+    returns = align_prices(random_prices).pct_change(fill_method=None)
+
+    corr = correlation_matrix(random_prices, block_size=block_size, n_jobs=n_jobs)
+    cov = covariance_matrix(random_prices, block_size=block_size, n_jobs=n_jobs)
+
+    assert_frame_equal(corr, returns.corr())
+    assert_frame_equal(cov, returns.cov())
+
+
+def test_correlation_matrix_float32(random_prices):
+    returns = align_prices(random_prices).pct_change(fill_method=None)
+
+    corr = correlation_matrix(random_prices, dtype='float32')
+
+    assert corr.values.dtype == np.float32
+    assert_frame_equal(corr, returns.corr(), check_dtype=False, atol=1e-3)
+
+
+def test_correlation_matrix_float32_prices(random_prices):
+    prices = align_prices(random_prices)
+
+    corr = correlation_matrix(random_prices, returns=False, dtype='float32')
+    cov = covariance_matrix(random_prices, returns=False, dtype='float32')
+
+    assert_frame_equal(corr, prices.corr(), check_dtype=False, atol=1e-4)
+    assert_frame_equal(cov, prices.cov(), check_dtype=False, rtol=1e-4)
+    assert np.allclose(np.diag(corr), 1, atol=1e-5)
+
+
+def test_correlation_matrix_min_periods(random_prices):
+    corr = correlation_matrix(random_prices, min_periods=100)
+
+    assert corr["T6"].isna().all()
+    assert corr["T0"].drop("T6").notna().all()
+
+
+def test_covariance_matrix_ewm(random_prices):
+    returns = align_prices(random_prices).pct_change(fill_method=None)
+    pair = returns[["T0", "T1"]].dropna()
+    weights = 0.5 ** ((len(returns) - 1 - returns.index.get_indexer(pair.index)) / 10)
+    mean = np.average(pair.values, axis=0, weights=weights)
+    centered = pair.values - mean
+    expected = (weights * centered[:, 0] * centered[:, 1]).sum() / (weights.sum() - (weights ** 2).sum() / weights.sum())
+
+    cov = covariance_matrix(random_prices, halflife=10)
+
+    assert cov.loc["T0", "T1"] == pytest.approx(expected)
+    assert correlation_matrix(random_prices, halflife=10).loc["T0", "T0"] == pytest.approx(1)
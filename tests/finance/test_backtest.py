@@ -0,0 +1,99 @@
+""" Unit tests for teii.finance.backtest module """
+
+
+import datetime as dt
+import numpy as np
+import pytest
+
+from teii.finance import FinanceClientParamError
+from teii.finance import TimeSeriesFinanceClient
+from teii.finance import backtest_crossover
+
+
+def crossover_reference(df, fast, slow, rebalance):
+    aclose = df['aclose'].to_numpy()
+    returns = aclose[1:] / aclose[:-1] - 1
+    fast_ma = df['aclose'].rolling(fast).mean().to_numpy()
+    slow_ma = df['aclose'].rolling(slow).mean().to_numpy()
+    portfolio = []
+    for week in range(len(returns)):
+        decided = (week // rebalance) * rebalance
+        position = 1.0 if fast_ma[decided] > slow_ma[decided] else 0.0
+        portfolio.append(position * returns[week])
+    return np.prod(1 + np.array(portfolio)) - 1
+
+
+def test_backtest_crossover(api_key_str,
+                            mocked_requests):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+
+    stats = backtest_crossover({"IBM": df}, [4, 10], [10, 30], [1, 4])
+
+    assert list(stats.index) == [(4, 10, 1), (4, 10, 4), (4, 30, 1), (4, 30, 4), (10, 30, 1), (10, 30, 4)]
+    for fast, slow, rebalance in stats.index:
+        assert stats.loc[(fast, slow, rebalance), 'total_return'] == pytest.approx(crossover_reference(df, fast, slow, rebalance))
+    assert (stats['exposure'] > 0).all()
+    assert (stats['max_drawdown'] >= 0).all()
+
+
+def test_backtest_crossover_many_tickers(api_key_str,
+                                         mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    single = backtest_crossover({"IBM": fc}, [4], [10], from_date=dt.date(2010, 1, 1), to_date=dt.date(2021, 12, 31))
+    double = backtest_crossover({"IBM": fc, "IBM2": fc}, [4], [10], from_date=dt.date(2010, 1, 1), to_date=dt.date(2021, 12, 31))
+
+    assert double['total_return'].iloc[0] == pytest.approx(single['total_return'].iloc[0])
+
+
+def test_backtest_crossover_dividends(api_key_str,
+                                      mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    with_dividends = backtest_crossover({"IBM": fc}, [4], [10])
+    without_dividends = backtest_crossover({"IBM": fc}, [4], [10], reinvest_dividends=False)
+
+    assert with_dividends['total_return'].iloc[0] > without_dividends['total_return'].iloc[0]
+
+
+def test_backtest_crossover_invalid_windows(api_key_str,
+                                            mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    with pytest.raises(FinanceClientParamError):
+        backtest_crossover({"IBM": fc}, [10], [4])
+    with pytest.raises(FinanceClientParamError):
+        backtest_crossover({"IBM": fc}, [0], [4])
+
+
+def test_backtest_crossover_listing_dates(api_key_str,
+                                          mocked_requests):
+    ibm = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    late = ibm.loc["2012-05-25":]
+
+    alone = {ticker: backtest_crossover({ticker: df}, [4], [10]).iloc[0] for ticker, df in [("IBM", ibm), ("LATE", late)]}
+    both = backtest_crossover({"IBM": ibm, "LATE": late}, [4], [10]).iloc[0]
+
+    # Before its listing the late ticker is simply not held
+    assert both['trades'] == pytest.approx((alone["IBM"]['trades'] + alone["LATE"]['trades']) / 2)
+    assert both['exposure'] * (len(ibm) - 1) == pytest.approx((alone["IBM"]['exposure'] * (len(ibm) - 1) +
+                                                               alone["LATE"]['exposure'] * (len(late) - 1)) / 2)
+
+
+def test_backtest_crossover_split(api_key_str,
+                                  mocked_requests):
+    df = TimeSeriesFinanceClient("AAPL", api_key_str).to_pandas()
+
+    stats = backtest_crossover({"AAPL": df}, [4], [10], [1, 4], from_date=dt.date(2013, 1, 1), to_date=dt.date(2021, 12, 31))
+    sliced = df.loc["2013-01-01":"2021-12-31"]
+
+    for fast, slow, rebalance in stats.index:
+        assert stats.loc[(fast, slow, rebalance), 'total_return'] == pytest.approx(crossover_reference(sliced, fast, slow, rebalance))
+    # The 2014 (7:1) and 2020 (4:1) splits would otherwise show up as -86% and -75% weeks
+    assert (stats['max_drawdown'] < 0.5).all()
+    assert (stats['total_return'] > 1).all()
+
+    price_only = backtest_crossover({"AAPL": df}, [4], [10], [1, 4], from_date=dt.date(2013, 1, 1), to_date=dt.date(2021, 12, 31),
+                                    reinvest_dividends=False)
+    assert (price_only['total_return'] < stats['total_return']).all()
+    assert (price_only['total_return'] > 1).all()
@@ -0,0 +1,87 @@
+""" Unit tests for teii.finance.interchange module """
+
+
+import io
+import numpy as np
+import pytest
+
+from teii.finance import FinanceClientCollection
+from teii.finance import FinanceClientParamError
+from teii.finance import TimeSeriesFinanceClient
+from teii.finance import read_arrow_stream
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_client_to_arrow(api_key_str,
+                         mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    table = fc.to_arrow()
+
+    assert table.column_names == ["date", "open", "high", "low", "close", "aclose", "volume", "dividend"]
+    assert table.schema.field("date").type == pa.timestamp("ns")
+    assert table.schema.field("volume").type == pa.int64()
+    assert table.num_rows == 1162
+    assert np.shares_memory(table.column("aclose").chunk(0).to_numpy(), fc.to_pandas()["aclose"].values)
+
+
+def test_client_dataframe_interchange(api_key_str,
+                                      mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    df = fc.__dataframe__()
+
+    assert df.num_rows() == 1162
+    assert list(df.column_names()) == fc.to_arrow().column_names
+
+
+def test_highest_weekly_variation_keeps_data_frame(api_key_str,
+                                                   mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    fc.highest_weekly_variation()
+
+    assert "high-low" not in fc.to_pandas().columns
+
+
+def test_collection_to_arrow(api_key_str,
+                             mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+    collection = FinanceClientCollection({"IBM": fc, "IBM2": fc})
+
+    table = collection.to_arrow()
+
+    assert table.num_rows == 2 * 1162
+    assert table.schema.field("ticker").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.column("ticker").to_pylist()[1161:1163] == ["IBM", "IBM2"]
+    assert collection.__dataframe__().num_rows() == 2 * 1162
+
+
+def test_collection_arrow_stream(api_key_str,
+                                 mocked_requests,
+                                 tmp_path):
+    collection = FinanceClientCollection([TimeSeriesFinanceClient("IBM", api_key_str)])
+    sink = io.BytesIO()
+
+    assert collection.write_arrow_stream(sink) == 1
+    assert collection.write_arrow_stream(tmp_path / "IBM.arrows") == 1
+
+    assert read_arrow_stream(pa.BufferReader(sink.getvalue())).equals(collection.to_arrow())
+    assert read_arrow_stream(tmp_path / "IBM.arrows").equals(collection.to_arrow())
+
+
+def test_collection_feather(api_key_str,
+                            mocked_requests,
+                            tmp_path):
+    feather = pytest.importorskip("pyarrow.feather")
+    collection = FinanceClientCollection([TimeSeriesFinanceClient("IBM", api_key_str)])
+
+    path = collection.write_feather(tmp_path / "IBM.feather")
+
+    assert feather.read_table(path).equals(collection.to_arrow())
+
+
+def test_collection_empty():
+    with pytest.raises(FinanceClientParamError):
+        FinanceClientCollection({}).to_arrow()
@@ -0,0 +1,94 @@
+""" Unit tests for teii.finance.archive module """
+
+
+import datetime as dt
+import pytest
+
+from pandas.testing import assert_frame_equal
+
+from teii.finance import FinanceClientIOError
+from teii.finance import FinanceClientInvalidData
+from teii.finance import PayloadArchive
+from teii.finance import SymbolSearchFinanceClient
+from teii.finance import TimeSeriesFinanceClient
+
+
+def test_put_deduplicates(tmp_path):
+    archive = PayloadArchive(tmp_path)
+
+    digest1 = archive.put("TWTR", b'{"a": 1}', dt.datetime(2022, 11, 4))
+    digest2 = archive.put("TWTR", b'{"a": 1}', dt.datetime(2022, 11, 11))
+
+    assert digest1 == digest2
+    assert digest1 in archive
+    assert len(list((tmp_path / 'objects').glob('*/*.json.gz'))) == 1
+    assert [entry['fetched'] for entry in archive.entries("TWTR")] == ["2022-11-04T00:00:00", "2022-11-11T00:00:00"]
+    assert archive.get(digest1) == b'{"a": 1}'
+    assert archive.load_json(digest1) == {"a": 1}
+
+
+def test_latest(tmp_path):
+    archive = PayloadArchive(tmp_path)
+
+    archive.put("IBM", b'{"a": 1}')
+    digest = archive.put("IBM", b'{"a": 2}')
+    archive.put("MSFT", b'{"a": 3}')
+
+    assert archive.latest("IBM") == digest
+    assert archive.latest("AAPL") is None
+
+
+def test_client_from_archive(api_key_str,
+                             mocked_requests,
+                             tmp_path):
+    archive = PayloadArchive(tmp_path)
+
+    fc = TimeSeriesFinanceClient("IBM", api_key_str, archive=archive)
+    fc_archived = TimeSeriesFinanceClient("IBM", archive=archive, from_archive=True)
+
+    assert len(archive.entries("IBM")) == 1
+    assert_frame_equal(fc_archived.to_pandas(), fc.to_pandas())
+
+
+def test_client_from_archive_missing(tmp_path):
+    with pytest.raises(FinanceClientIOError):
+        TimeSeriesFinanceClient("IBM", archive=PayloadArchive(tmp_path), from_archive=True)
+
+
+def test_latest_valid_and_function(tmp_path):
+    archive = PayloadArchive(tmp_path)
+
+    digest = archive.put("IBM", b'{"a": 1}', function="TIME_SERIES_WEEKLY_ADJUSTED")
+    archive.put("IBM", b'{"Note": "throttled"}', function="TIME_SERIES_WEEKLY_ADJUSTED", valid=False)
+    search_digest = archive.put("IBM", b'{"bestMatches": []}', function="SYMBOL_SEARCH")
+
+    assert archive.latest("IBM", "TIME_SERIES_WEEKLY_ADJUSTED") == digest
+    assert archive.latest("IBM", "SYMBOL_SEARCH") == search_digest
+    assert archive.latest("IBM") == search_digest
+    assert len(archive.entries("IBM", "TIME_SERIES_WEEKLY_ADJUSTED")) == 2
+
+
+def test_client_archives_invalid_response(api_key_str,
+                                          mocked_requests,
+                                          tmp_path):
+    archive = PayloadArchive(tmp_path)
+
+    with pytest.raises(FinanceClientInvalidData):
+        TimeSeriesFinanceClient("NODATA", api_key_str, archive=archive)
+
+    assert [entry['valid'] for entry in archive.entries("NODATA")] == [False]
+    assert archive.latest("NODATA") is None
+    with pytest.raises(FinanceClientIOError):
+        TimeSeriesFinanceClient("NODATA", archive=archive, from_archive=True)
+
+
+def test_client_from_archive_function(api_key_str,
+                                      mocked_requests,
+                                      tmp_path):
+    archive = PayloadArchive(tmp_path)
+
+    TimeSeriesFinanceClient("IBM", api_key_str, archive=archive)
+
+    with pytest.raises(FinanceClientIOError):
+        SymbolSearchFinanceClient("IBM", archive=archive, from_archive=True)
+    assert archive.entries("IBM")[0]['function'] == "TIME_SERIES_WEEKLY_ADJUSTED"
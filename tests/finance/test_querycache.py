@@ -0,0 +1,97 @@
+""" Unit tests for teii.finance.cache module """
+
+
+import numpy as np
+import pandas as pd
+import pytest
+import threading
+
+from teii.finance import FinanceClientParamError
+from teii.finance.cache import QueryCache
+from teii.finance.cache import _read_only
+from teii.finance.cache import memoized_query
+
+
+def test_constructor_invalid_size():
+    with pytest.raises(FinanceClientParamError):
+        QueryCache(-1)
+
+
+def test_lru_eviction():
+    cache = QueryCache(2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.info() == {'hits': 3, 'misses': 1, 'size': 2, 'maxsize': 2}
+
+
+def test_put_stale_generation():
+    cache = QueryCache(2)
+
+    generation = cache.generation
+    cache.clear()
+    cache.put("a", 1, generation)
+
+    assert cache.get("a") == (False, None)
+    cache.put("a", 1, cache.generation)
+    assert cache.get("a") == (True, 1)
+
+
+def test_memoized_query_refresh_while_computing():
+    class Client:
+        def __init__(self):
+            self._query_cache = QueryCache()
+            self.data = 1
+            self.refresh_while_computing = True
+
+        @memoized_query
+        def query(self):
+            data = self.data
+            if self.refresh_while_computing:
+                self.refresh_while_computing = False
+                self.data = 2
+                self._query_cache.clear()
+            return data
+
+    client = Client()
+
+    assert client.query() == 1
+    assert client.query() == 2
+    assert client.query() == 2
+
+
+def test_concurrent_access():
+    cache = QueryCache(8)
+
+    def worker(offset):
+        for i in range(2000):
+            cache.put((offset + i) % 16, i)
+            cache.get((offset + i * 7) % 16)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = cache.info()
+    assert info['size'] == 8
+    assert info['hits'] + info['misses'] == 8 * 2000
+
+
+def test_read_only_data_frame():
+    df = pd.DataFrame({'price': [1.0, 2.0], 'volume': np.array([10, 20], dtype=np.int64)})
+
+    frozen = _read_only(df)
+
+    with pytest.raises(ValueError):
+        frozen['price'].values[0] = 0.0
+    with pytest.raises(ValueError):
+        frozen['volume'].values[0] = 0
+    assert df.loc[0, 'price'] == 1.0
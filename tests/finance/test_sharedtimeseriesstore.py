@@ -0,0 +1,170 @@
+""" Unit tests for teii.finance.shared module """
+
+
+import numpy as np
+import os
+import pytest
+import threading
+
+from pandas.testing import assert_series_equal
+
+from teii.finance import FinanceClientIOError
+from teii.finance import FinanceClientParamError
+from teii.finance import SharedTimeSeriesStore
+from teii.finance import TimeSeriesFinanceClient
+
+
+def test_publish_attach(api_key_str,
+                        mocked_requests,
+                        tmp_path):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+
+    assert store.publish("IBM", df) == 1
+
+    sts = store.attach("IBM")
+
+    assert sts.version == 1
+    assert store.tickers() == ["IBM"]
+    assert_series_equal(sts.series('aclose'), df['aclose'], check_freq=False)
+    assert_series_equal(sts.series('volume'), df['volume'], check_freq=False)
+
+
+def test_attach_read_only_views(api_key_str,
+                                mocked_requests,
+                                tmp_path):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    store.publish("IBM", df)
+
+    sts = store.attach("IBM")
+    prices = sts.prices()
+
+    assert np.shares_memory(prices.values, sts.array('open'))
+    assert np.shares_memory(sts.series('volume').values, sts.array('volume'))
+    with pytest.raises(ValueError):
+        sts.array('close')[0] = 0.0
+
+
+def test_publish_new_version(api_key_str,
+                             mocked_requests,
+                             tmp_path):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    store.publish("IBM", df)
+
+    old = store.attach("IBM")
+    assert old.is_current()
+
+    store.publish("IBM", df.iloc[:-1])
+    new = store.attach("IBM")
+
+    assert not old.is_current()
+    assert new.version == 2
+    assert len(old.index) == len(new.index) + 1
+    assert store.prune("IBM", keep=1) == [1]
+    assert old.series('aclose').count() == len(df)
+
+
+def test_publish_pointer_failure(api_key_str,
+                                 mocked_requests,
+                                 tmp_path,
+                                 monkeypatch):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    store.publish("IBM", df)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr("teii.finance.shared.os.replace", failing_replace)
+        with pytest.raises(FinanceClientIOError):
+            store.publish("IBM", df)
+
+    assert store.versions("IBM") == [1]
+    assert store.publish("IBM", df) == 2
+
+
+def test_publish_orphaned_version(api_key_str,
+                                  mocked_requests,
+                                  tmp_path):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    store.publish("IBM", df)
+    (tmp_path / "IBM" / "v000002").mkdir()
+
+    assert store.publish("IBM", df) == 3
+    assert store.attach("IBM").version == 3
+    assert store.versions("IBM") == [1, 2, 3]
+
+
+def test_publish_version_taken(api_key_str,
+                               mocked_requests,
+                               tmp_path,
+                               monkeypatch):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    store.publish("IBM", df)
+    competitor = SharedTimeSeriesStore(tmp_path)
+    rename = os.rename
+
+    def rename_after_competitor(src, dst):
+        # Another publisher takes the same version number just before us
+        monkeypatch.setattr("teii.finance.shared.os.rename", rename)
+        assert competitor.publish("IBM", df) == 2
+        rename(src, dst)
+
+    monkeypatch.setattr("teii.finance.shared.os.rename", rename_after_competitor)
+
+    assert store.publish("IBM", df) == 3
+    assert store.current_version("IBM") == 3
+    assert store.versions("IBM") == [1, 2, 3]
+
+
+def test_publish_pointer_not_backwards(api_key_str,
+                                       mocked_requests,
+                                       tmp_path,
+                                       monkeypatch):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    competitor = SharedTimeSeriesStore(tmp_path)
+    rename = os.rename
+
+    def rename_before_competitor(src, dst):
+        # A faster publisher writes a newer version before our pointer is updated
+        monkeypatch.setattr("teii.finance.shared.os.rename", rename)
+        rename(src, dst)
+        assert competitor.publish("IBM", df) == 2
+
+    monkeypatch.setattr("teii.finance.shared.os.rename", rename_before_competitor)
+
+    assert store.publish("IBM", df) == 1
+    assert store.current_version("IBM") == 2
+
+
+def test_publish_concurrent(api_key_str,
+                            mocked_requests,
+                            tmp_path):
+    df = TimeSeriesFinanceClient("IBM", api_key_str).to_pandas()
+    store = SharedTimeSeriesStore(tmp_path)
+    versions = []
+
+    def worker():
+        versions.append(store.publish("IBM", df))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(versions) == list(range(1, 9))
+    assert store.current_version("IBM") == 8
+
+
+def test_attach_not_published(tmp_path):
+    store = SharedTimeSeriesStore(tmp_path)
+
+    with pytest.raises(FinanceClientParamError):
+        store.attach("IBM")
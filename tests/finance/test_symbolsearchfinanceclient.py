@@ -0,0 +1,73 @@
+""" Unit tests for teii.finance.search module """
+
+
+import pytest
+import teii.finance.finance
+
+from teii.finance import FinanceClientInvalidData
+from teii.finance import FinanceClientInvalidAPIKey
+from teii.finance import PayloadArchive
+from teii.finance import SymbolIndex
+from teii.finance import SymbolSearchFinanceClient
+
+
+def test_constructor_success(api_key_str,
+                             mocked_requests):
+    df = SymbolSearchFinanceClient("Pfizer", api_key_str).to_pandas()
+
+    assert list(df['symbol']) == ["PFE", "PFE.DEX", "PFE.FRK", "PFEB.FRK"]
+    assert df['match_score'].dtype == float
+
+
+def test_constructor_failure_invalid_api_key():
+    with pytest.raises(FinanceClientInvalidAPIKey):
+        SymbolSearchFinanceClient("Pfizer")
+
+
+def test_constructor_invalid_data(api_key_str,
+                                  mocked_requests):
+    with pytest.raises(FinanceClientInvalidData):
+        SymbolSearchFinanceClient("NODATA", api_key_str)
+
+
+def test_index_symbol_prefix(symbol_index_listing):
+    assert [r['symbol'] for r in symbol_index_listing.search("a", limit=2)] == ["AAPL", "AMZN"]
+    assert [r['symbol'] for r in symbol_index_listing.search("am")] == ["AMZN"]
+    assert [r['symbol'] for r in symbol_index_listing.search("ibm")] == ["IBM"]
+    assert "msft" in symbol_index_listing
+
+
+def test_index_name_prefix(symbol_index_listing):
+    assert [r['symbol'] for r in symbol_index_listing.search("micro")] == ["MSFT"]
+    assert [r['symbol'] for r in symbol_index_listing.search("business")] == ["IBM"]
+
+
+def test_index_fuzzy_name(symbol_index_listing):
+    assert [r['symbol'] for r in symbol_index_listing.search("microsfot")] == ["MSFT"]
+    assert symbol_index_listing.search("zzzz") == []
+
+
+def test_index_lookup_fallback(api_key_str,
+                               mocked_requests):
+    index = SymbolIndex()
+
+    records = index.lookup("Pfizer", api_key_str)
+
+    assert [r['symbol'] for r in records] == ["PFE", "PFE.DEX", "PFE.FRK", "PFEB.FRK"]
+    assert len(index) == 4
+    assert [r['symbol'] for r in index.search("PFEB")] == ["PFEB.FRK"]
+
+
+def test_index_lookup_miss(api_key_str,
+                           mocked_requests,
+                           tmp_path):
+    index = SymbolIndex()
+    archive = PayloadArchive(tmp_path)
+    calls = teii.finance.finance.requests.get.call_count
+
+    assert index.lookup("NOMATCH", api_key_str, archive=archive) == []
+    assert index.lookup("nomatch", api_key_str) == []
+    assert index.lookup("NOMATCHX", api_key_str) == []
+
+    assert teii.finance.finance.requests.get.call_count == calls + 1
+    assert archive.latest("NOMATCH", "SYMBOL_SEARCH") is not None
@@ -2,9 +2,11 @@
 
 
 import datetime as dt
+import numpy as np
+import pandas as pd
 import pytest
 
-from pandas.testing import assert_series_equal
+from pandas.testing import assert_frame_equal, assert_series_equal
 
 from teii.finance import FinanceClientInvalidData
 from teii.finance import TimeSeriesFinanceClient
@@ -158,3 +160,95 @@ def test_highest_weekly_variation_dates(api_key_str,
     tupla_esperada = (dt.date(year=2018, month=4, day=20), 162.0, 144.51, 17.49000000000001)
 
     assert ps == tupla_esperada
+
+
+def test_resample_invalid_freq(api_key_str,
+                               mocked_requests):
+    with pytest.raises(FinanceClientParamError):
+        TimeSeriesFinanceClient("IBM", api_key_str).resample("daily")
+
+
+def test_resample_invalid_dates(api_key_str,
+                                mocked_requests):
+    with pytest.raises(FinanceClientParamError):
+        TimeSeriesFinanceClient("IBM", api_key_str).resample("monthly", dt.date(2020, 10, 10), dt.date(2020, 10, 9))
+
+
+@pytest.mark.parametrize("freq, rule", [("monthly", "MS"), ("quarterly", "QS"), ("yearly", "YS")])
+def test_resample_no_dates(api_key_str,
+                           mocked_requests,
+                           freq,
+                           rule):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    df = fc.resample(freq)
+
+    expected = fc.to_pandas().resample(rule).agg({"open": "first", "high": "max", "low": "min",
+                                                  "close": "last", "aclose": "last",
+                                                  "volume": "sum", "dividend": "sum"}).dropna()
+
+    assert_frame_equal(df, expected, check_freq=False, check_dtype=False)
+
+
+def test_resample_dates(api_key_str,
+                        mocked_requests,
+                        pandas_series_IBM_dividends_filtered):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    df = fc.resample("yearly", dt.date(2015, 6, 1), dt.date(2019, 6, 1))
+
+    assert df.shape[0] == 5
+
+    assert_series_equal(df['dividend'], pandas_series_IBM_dividends_filtered, check_freq=False)
+
+    assert fc.resample("yearly") is not fc.resample("yearly")
+
+
+def test_query_cache(api_key_str,
+                     mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    ps1 = fc.weekly_price(dt.date(2019, 1, 1), dt.date(2021, 12, 31))
+    ps2 = fc.weekly_price(from_date=pd.Timestamp(2019, 1, 1), to_date=dt.datetime(2021, 12, 31))
+
+    assert ps1 is not ps2
+    assert np.shares_memory(ps1.values, ps2.values)
+    assert fc.cache_info()['hits'] == 1
+    assert fc.cache_info()['misses'] == 1
+
+    with pytest.raises(ValueError):
+        ps1.iloc[0] = 0.0
+
+
+def test_query_cache_wrapper(api_key_str,
+                             mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    ps1 = fc.yearly_dividends()
+    ps1.index = ps1.index.year
+    ps1.name = "hacked"
+    ps2 = fc.yearly_dividends()
+
+    assert ps2.name == "dividend"
+    assert isinstance(ps2.index, pd.DatetimeIndex)
+
+
+def test_query_cache_refresh(api_key_str,
+                             mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str)
+
+    ps1 = fc.yearly_dividends()
+    fc.refresh()
+    ps2 = fc.yearly_dividends()
+
+    assert ps1 is not ps2
+    assert_series_equal(ps1, ps2)
+    assert fc.cache_info()['misses'] == 2
+
+
+def test_query_cache_disabled(api_key_str,
+                              mocked_requests):
+    fc = TimeSeriesFinanceClient("IBM", api_key_str, cache_size=0)
+
+    assert fc.weekly_volume() is not fc.weekly_volume()
+    assert fc.cache_info()['size'] == 0
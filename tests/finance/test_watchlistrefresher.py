@@ -0,0 +1,148 @@
+""" Unit tests for teii.finance.refresher module """
+
+
+import pytest
+
+from teii.finance import FinanceClientIOError
+from teii.finance import FinanceClientParamError
+from teii.finance import SharedTimeSeriesStore
+from teii.finance import TimeSeriesFinanceClient
+from teii.finance import WatchlistRefresher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_constructor_invalid_budget(api_key_str):
+    with pytest.raises(FinanceClientParamError):
+        WatchlistRefresher(["IBM"], api_key_str, requests_per_minute=0)
+
+
+def test_run_pending(api_key_str,
+                     mocked_requests):
+    clock = FakeClock()
+    wr = WatchlistRefresher(["IBM", "NODATA"], api_key_str, clock=clock)
+
+    assert wr.get("IBM") is None
+    assert wr.due() == ["IBM", "NODATA"]
+
+    assert wr.run_pending() == ["IBM"]
+
+    assert isinstance(wr.get("IBM"), TimeSeriesFinanceClient)
+    assert wr.due() == []
+    assert wr.metrics()['failures'] == 1
+    assert wr.metrics()['requests_last_minute'] == 2
+
+
+def test_run_pending_budget(api_key_str,
+                            mocked_requests):
+    clock = FakeClock()
+    wr = WatchlistRefresher(["IBM"], api_key_str, max_age=60, requests_per_minute=1, requests_per_day=2, clock=clock)
+
+    assert wr.run_pending() == ["IBM"]
+    client = wr.get("IBM")
+
+    clock.now = 59.0
+    assert wr.due() == []
+    clock.now = 61.0
+    assert wr.due() == ["IBM"]
+    assert wr.run_pending() == ["IBM"]
+    assert wr.get("IBM") is not client
+
+    clock.now = 200.0
+    assert wr.run_pending() == []
+    assert wr.metrics()['queue_depth'] == 1
+    assert wr.metrics()['requests_last_day'] == 2
+
+    clock.now = 24 * 60 * 60 + 1.0
+    assert wr.run_pending() == ["IBM"]
+
+
+def test_run_pending_backoff(api_key_str,
+                             mocked_requests):
+    clock = FakeClock()
+    wr = WatchlistRefresher(["NODATA"], api_key_str, max_age=600, retry_delay=60, clock=clock)
+
+    assert wr.run_pending() == []
+    clock.now = 59.0
+    assert wr.due() == []
+    clock.now = 60.0
+    assert wr.due() == ["NODATA"]
+    assert wr.run_pending() == []
+
+    clock.now = 179.0
+    assert wr.due() == []
+    clock.now = 180.0
+    assert wr.due() == ["NODATA"]
+
+
+def test_run_pending_failed_not_starving(api_key_str,
+                                         mocked_requests):
+    clock = FakeClock()
+    wr = WatchlistRefresher(["IBM", "NODATA1", "NODATA2"], api_key_str, max_age=60, requests_per_minute=2, clock=clock)
+
+    assert wr.run_pending() == ["IBM"]
+    for minute in range(1, 6):
+        clock.now = 61.0 * minute
+        assert wr.run_pending() == ["IBM"]
+        assert wr.staleness()["IBM"] == 0.0
+
+    assert wr.metrics()['failures'] == 6
+
+
+def test_priority(api_key_str,
+                  mocked_requests):
+    clock = FakeClock()
+    wr = WatchlistRefresher(["NODATA", "IBM"], api_key_str, max_age=60, clock=clock)
+    wr.refresh("IBM")
+    wr._refreshed["NODATA"] = 0.0
+
+    clock.now = 120.0
+    assert wr.due() == ["NODATA", "IBM"]
+
+    wr.get("IBM")
+    assert wr.due() == ["IBM", "NODATA"]
+
+
+def test_publish_store(api_key_str,
+                       mocked_requests,
+                       tmp_path):
+    store = SharedTimeSeriesStore(tmp_path)
+    wr = WatchlistRefresher(["IBM"], api_key_str, store=store)
+
+    wr.run_pending()
+
+    assert store.current_version("IBM") == 1
+    assert wr.staleness()["IBM"] is not None
+
+
+def test_publish_store_failure(api_key_str,
+                               mocked_requests,
+                               tmp_path,
+                               monkeypatch):
+    store = SharedTimeSeriesStore(tmp_path)
+    wr = WatchlistRefresher(["IBM"], api_key_str, store=store)
+
+    def failing_publish(ticker, data_frame):
+        raise FinanceClientIOError("disk full")
+
+    monkeypatch.setattr(store, "publish", failing_publish)
+
+    assert wr.run_pending() == ["IBM"]
+    assert isinstance(wr.get("IBM"), TimeSeriesFinanceClient)
+    assert wr.due() == []
+    assert wr.metrics()['failures'] == 0
+    assert wr.metrics()['store_failures'] == 1
+
+
+def test_start_stop(api_key_str,
+                    mocked_requests):
+    with WatchlistRefresher(["IBM"], api_key_str) as wr:
+        pass
+
+    assert wr.get("IBM") is not None